@@ -1,11 +1,17 @@
 """
 Logging configuration
 """
+import atexit
 import logging
+import queue
 import sys
-from typing import Dict, Any
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Any, Optional
 from .settings import settings
 
+# Background listener that owns the real output handler
+_log_listener: Optional[QueueListener] = None
+
 
 class ColoredFormatter(logging.Formatter):
     """Colored log formatter for development"""
@@ -19,33 +25,64 @@ class ColoredFormatter(logging.Formatter):
     }
     RESET = '\033[0m'
     
+    def __init__(self, fmt=None, *args, **kwargs):
+        super().__init__(fmt, *args, **kwargs)
+        # Debug mode cannot change without a restart, so resolve it once and
+        # prebuild the colored level names
+        self._decorated = {
+            level: f"{color}{level}{self.RESET}"
+            for level, color in self.COLORS.items()
+        } if settings.is_development else None
+    
     def format(self, record):
-        if settings.is_development:
-            color = self.COLORS.get(record.levelname, self.RESET)
-            record.levelname = f"{color}{record.levelname}{self.RESET}"
-        return super().format(record)
+        if not self._decorated:
+            return super().format(record)
+        
+        levelname = record.levelname
+        decorated = self._decorated.get(levelname)
+        if decorated is None:
+            return super().format(record)
+        
+        record.levelname = decorated
+        try:
+            return super().format(record)
+        finally:
+            # Don't leak ANSI codes to other handlers sharing the record
+            record.levelname = levelname
 
 
 def setup_logging() -> None:
     """Configure application logging"""
+    global _log_listener
+    
+    if _log_listener is not None:
+        return
+    
+    # Real output handler, driven by the listener thread
+    stream_handler = logging.StreamHandler(sys.stdout)
+    
+    # Use colored formatter in development
+    if settings.is_development:
+        stream_handler.setFormatter(ColoredFormatter(settings.log_format))
+    else:
+        stream_handler.setFormatter(logging.Formatter(settings.log_format))
+    
+    # Request threads only enqueue records; stdout writes happen off the hot path
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
     
     # Root logger configuration
     logging.basicConfig(
         level=getattr(logging, settings.log_level.upper()),
-        format=settings.log_format,
-        handlers=[
-            logging.StreamHandler(sys.stdout)
-        ]
+        handlers=[queue_handler]
     )
     
-    # Get root logger
-    root_logger = logging.getLogger()
+    _log_listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _log_listener.start()
     
-    # Use colored formatter in development
-    if settings.is_development:
-        for handler in root_logger.handlers:
-            if isinstance(handler, logging.StreamHandler):
-                handler.setFormatter(ColoredFormatter(settings.log_format))
+    # Flush pending records on shutdown
+    atexit.register(_log_listener.stop)
     
     # Set specific logger levels
     logging.getLogger('werkzeug').setLevel(logging.WARNING)  # Reduce Flask noise
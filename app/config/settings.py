@@ -2,6 +2,7 @@
 Application configuration management
 """
 import os
+from functools import cached_property, lru_cache
 from typing import Optional
 from pydantic_settings import BaseSettings
 from pydantic import Field
@@ -14,15 +15,18 @@ class Settings(BaseSettings):
     host: str = Field(default="0.0.0.0", env="HOST")
     port: int = Field(default=3002, env="PORT")
     debug: bool = Field(default=False, env="DEBUG")
+    return_traceback_in_response: bool = Field(default=True, env="RETURN_TRACEBACK_IN_RESPONSE")  # debug mode only
     
     # File Management
     output_dir: str = Field("/app/generated_videos", env="OUTPUT_DIR")
     cleanup_interval: int = Field(default=3600, env="CLEANUP_INTERVAL")  # seconds
     max_file_age: int = Field(default=3600, env="MAX_FILE_AGE")  # seconds
+    scratch_dir: Optional[str] = Field(None, env="SCRATCH_DIR")  # defaults to /dev/shm when writable
     
     # Audio Processing
     audio_analysis_workers: int = Field(default=10, env="AUDIO_ANALYSIS_WORKERS")
     audio_analysis_timeout: int = Field(default=30, env="AUDIO_ANALYSIS_TIMEOUT")
+    audio_duration_cache_ttl: int = Field(default=86400, env="AUDIO_DURATION_CACHE_TTL")  # seconds, 0 disables
     
     # Transcription Settings
     transcription_workers: int = Field(default=5, env="TRANSCRIPTION_WORKERS")
@@ -33,16 +37,29 @@ class Settings(BaseSettings):
     whisper_python_model: str = Field(default="medium", env="WHISPER_PYTHON_MODEL")
     whisper_device: str = Field(default="cpu", env="WHISPER_DEVICE")  # "auto" | "cpu" | "cuda" | "mps"
     whisper_cache_dir: str = Field("/app/whisper_cache", env="WHISPER_CACHE_DIR")
+    whisper_backend: str = Field(default="openai", env="WHISPER_BACKEND")  # "openai" | "faster"
+    whisper_batch_size: int = Field(default=16, env="WHISPER_BATCH_SIZE")  # faster-whisper batched inference
+    whisper_preload: bool = Field(default=True, env="WHISPER_PRELOAD")  # load the model at worker start
     
     # FFmpeg Settings
     ffmpeg_timeout: int = Field(default=600, env="FFMPEG_TIMEOUT")  # 10 minutes
     video_quality_crf: int = Field(default=23, env="VIDEO_QUALITY_CRF")
     video_preset: str = Field(default="fast", env="VIDEO_PRESET")
     video_generation_workers: int = Field(2, env="VIDEO_GENERATION_WORKERS")
+    max_queued_jobs: int = Field(default=0, env="MAX_QUEUED_JOBS")  # 0 = 2 x VIDEO_GENERATION_WORKERS
+    job_store: str = Field(default="sqlite", env="JOB_STORE")  # "sqlite" | "file"
+    use_hardware_accel: bool = Field(default=False, env="USE_HARDWARE_ACCEL")  # NVENC/QSV/VideoToolbox, falls back to libx264
+    video_encoder: str = Field(default="auto", env="VIDEO_ENCODER")  # auto | h264_nvenc | h264_qsv | h264_videotoolbox | libx264
+    nvenc_preset: str = Field(default="p4", env="NVENC_PRESET")  # p1 (fastest) .. p7 (best quality)
+    max_concurrent_transcodes: int = Field(default=0, env="MAX_CONCURRENT_TRANSCODES")  # 0 = auto
+    ffmpeg_probesize: str = Field(default="32k", env="FFMPEG_PROBESIZE")  # bytes read to detect each input's streams
+    ffmpeg_analyzeduration: int = Field(default=100000, env="FFMPEG_ANALYZEDURATION")  # microseconds; 0 = FFmpeg default (5 s)
     
     # URL Processing
     url_redirect_timeout: int = Field(default=10, env="URL_REDIRECT_TIMEOUT")
     download_timeout: int = Field(default=60, env="DOWNLOAD_TIMEOUT")
+    image_prefetch_timeout: int = Field(default=60, env="IMAGE_PREFETCH_TIMEOUT")  # seconds for all of a job's image downloads
+    image_prefetch_max_bytes: int = Field(default=20 * 1024 * 1024, env="IMAGE_PREFETCH_MAX_BYTES")  # per image
     
     # Logging
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
@@ -53,6 +70,7 @@ class Settings(BaseSettings):
     
     # Security
     max_content_length: int = Field(default=16 * 1024 * 1024, env="MAX_CONTENT_LENGTH")  # 16MB
+    use_x_sendfile: bool = Field(default=False, env="USE_X_SENDFILE")  # let a fronting server send downloads
     rate_limit_per_minute: int = Field(default=60, env="RATE_LIMIT_PER_MINUTE")
     api_key: Optional[str] = Field(None, env="API_KEY", description="Required API key for authentication")
     
@@ -63,21 +81,37 @@ class Settings(BaseSettings):
         env_file = ".env"
         env_file_encoding = "utf-8"
         case_sensitive = False
+        # Settings are read once at startup and never change afterwards
+        frozen = True
     
     def ensure_output_dir(self) -> None:
         """Ensure output directory exists"""
         os.makedirs(self.output_dir, exist_ok=True)
     
-    @property
+    @cached_property
     def is_development(self) -> bool:
         """Check if running in development mode"""
         return self.debug
     
-    @property
+    @cached_property
     def is_production(self) -> bool:
         """Check if running in production mode"""
         return not self.debug
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the process-wide settings instance
+    
+    The environment is parsed once; call get_settings.cache_clear() to force
+    a re-read (e.g. in tests).
+    
+    Returns:
+        Settings instance
+    """
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
\ No newline at end of file
+settings = get_settings()
\ No newline at end of file
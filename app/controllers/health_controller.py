@@ -1,15 +1,18 @@
 """
 Health check and system status controller
 """
+from datetime import datetime
+from functools import lru_cache
 from flask import Blueprint, jsonify
 from ..models.response_models import HealthResponse, ErrorResponse
 from ..config.logging_config import get_logger
 from ..config.settings import settings
+from ..utils.cache_utils import ttl_cache
 from ..services import (
-    AudioService, 
-    TranscriptionService, 
-    FFmpegService, 
-    FileService
+    get_audio_service,
+    get_transcription_service,
+    get_ffmpeg_service,
+    get_file_service
 )
 
 logger = get_logger(__name__)
@@ -17,11 +20,37 @@ logger = get_logger(__name__)
 # Create blueprint
 health_bp = Blueprint('health', __name__)
 
-# Initialize services for health checks
-audio_service = AudioService()
-transcription_service = TranscriptionService()
-ffmpeg_service = FFmpegService()
-file_service = FileService()
+# Shared service instances for health checks
+audio_service = get_audio_service()
+transcription_service = get_transcription_service()
+ffmpeg_service = get_ffmpeg_service()
+file_service = get_file_service()
+
+
+# Probes are hit every few seconds; avoid spawning ffmpeg / walking the
+# output directory on each one
+@ttl_cache(ttl=30, maxsize=1)
+def _cached_ffmpeg_available() -> bool:
+    """FFmpeg availability, cached for 30 seconds"""
+    return ffmpeg_service.validate_ffmpeg_availability()
+
+
+@ttl_cache(ttl=30, maxsize=1)
+def _cached_ffmpeg_version():
+    """FFmpeg version string, cached for 30 seconds"""
+    return ffmpeg_service.get_ffmpeg_version()
+
+
+@ttl_cache(ttl=10, maxsize=1)
+def _cached_file_permission_errors() -> list:
+    """Output directory permission errors, cached for 10 seconds"""
+    return file_service.validate_file_permissions()
+
+
+@ttl_cache(ttl=10, maxsize=1)
+def _cached_disk_usage() -> dict:
+    """Output directory disk usage, cached for 10 seconds"""
+    return file_service.get_disk_usage()
 
 
 @health_bp.route('/health', methods=['GET'])
@@ -33,17 +62,18 @@ def health_check():
         JSON response with service health status
     """
     try:
-        response = HealthResponse(
+        # Constant, trusted values - skip validation
+        response = HealthResponse.model_construct(
             status='ok',
             service='video-generator',
             version='1.0.0'
         )
-        return jsonify(response.dict()), 200
+        return jsonify(response.model_dump()), 200
         
     except Exception as e:
         logger.error(f"Health check failed: {e}")
-        error_response = ErrorResponse(error="Health check failed")
-        return jsonify(error_response.dict()), 500
+        error_response = ErrorResponse.model_construct(error="Health check failed")
+        return jsonify(error_response.model_dump()), 500
 
 
 @health_bp.route('/health/detailed', methods=['GET'])
@@ -56,27 +86,30 @@ def detailed_health_check():
     """
     try:
         logger.debug("Performing detailed health check...")
+        output_dir = settings.output_dir
+        subtitles_enabled = settings.enable_subtitles
+        is_development = settings.is_development
         
         # Check all services
         health_status = {
             'service': 'video-generator',
             'status': 'ok',
             'version': '1.0.0',
-            'timestamp': health_bp.json.encode_datetime(HealthResponse().timestamp),
+            'timestamp': datetime.utcnow(),
             'checks': {}
         }
         
         # File system check
-        file_errors = file_service.validate_file_permissions()
+        file_errors = _cached_file_permission_errors()
         health_status['checks']['filesystem'] = {
             'status': 'ok' if not file_errors else 'error',
             'errors': file_errors,
-            'output_directory': settings.output_dir
+            'output_directory': output_dir
         }
         
         # FFmpeg availability check
-        ffmpeg_available = ffmpeg_service.validate_ffmpeg_availability()
-        ffmpeg_version = ffmpeg_service.get_ffmpeg_version()
+        ffmpeg_available = _cached_ffmpeg_available()
+        ffmpeg_version = _cached_ffmpeg_version()
         health_status['checks']['ffmpeg'] = {
             'status': 'ok' if ffmpeg_available else 'error',
             'available': ffmpeg_available,
@@ -89,13 +122,13 @@ def detailed_health_check():
         health_status['checks']['transcription'] = {
             'status': 'ok' if not transcription_errors else 'warning',
             'errors': transcription_errors,
-            'enabled': settings.enable_subtitles,
+            'enabled': subtitles_enabled,
             'backend': 'python',
             'whisper_info': whisper_info
         }
         
         # Disk usage check
-        disk_usage = file_service.get_disk_usage()
+        disk_usage = _cached_disk_usage()
         health_status['checks']['storage'] = {
             'status': 'ok',
             'usage': disk_usage
@@ -106,18 +139,18 @@ def detailed_health_check():
         health_status['checks']['configuration'] = {
             'status': 'ok' if not config_issues else 'warning',
             'issues': config_issues,
-            'environment': 'development' if settings.is_development else 'production'
+            'environment': 'development' if is_development else 'production'
         }
         
-        # Determine overall status
-        has_errors = any(
-            check.get('status') == 'error' 
-            for check in health_status['checks'].values()
-        )
-        has_warnings = any(
-            check.get('status') == 'warning' 
-            for check in health_status['checks'].values()
-        )
+        # Determine overall status in a single pass (errors take precedence)
+        has_errors = has_warnings = False
+        for check in health_status['checks'].values():
+            check_status = check.get('status')
+            if check_status == 'error':
+                has_errors = True
+                break
+            if check_status == 'warning':
+                has_warnings = True
         
         if has_errors:
             health_status['status'] = 'error'
@@ -133,8 +166,8 @@ def detailed_health_check():
         
     except Exception as e:
         logger.error(f"Detailed health check failed: {e}")
-        error_response = ErrorResponse(error="Detailed health check failed")
-        return jsonify(error_response.dict()), 500
+        error_response = ErrorResponse.model_construct(error="Detailed health check failed")
+        return jsonify(error_response.model_dump()), 500
 
 
 @health_bp.route('/metrics', methods=['GET'])
@@ -148,11 +181,8 @@ def metrics():
     try:
         logger.debug("Collecting system metrics...")
         
-        # Get disk usage
-        disk_usage = file_service.get_disk_usage()
-        
-        # Get video list for metrics
-        videos = file_service.list_video_files(limit=1000)
+        # Get video list and disk usage in one directory scan
+        videos, disk_usage = file_service.list_and_measure(limit=1000)
         
         # Calculate metrics
         metrics_data = {
@@ -162,16 +192,10 @@ def metrics():
                 'total_size_gb': disk_usage['total_size_gb']
             },
             'storage': disk_usage,
-            'configuration': {
-                'audio_workers': settings.audio_analysis_workers,
-                'transcription_workers': settings.transcription_workers,
-                'subtitles_enabled': settings.enable_subtitles,
-                'output_directory': settings.output_dir,
-                'cleanup_interval': settings.cleanup_interval
-            },
+            'configuration': _configuration_metrics(),
             'system': {
-                'ffmpeg_available': ffmpeg_service.validate_ffmpeg_availability(),
-                'ffmpeg_version': ffmpeg_service.get_ffmpeg_version(),
+                'ffmpeg_available': _cached_ffmpeg_available(),
+                'ffmpeg_version': _cached_ffmpeg_version(),
                 'supported_audio_formats': transcription_service.get_supported_audio_formats()
             }
         }
@@ -180,8 +204,8 @@ def metrics():
         
     except Exception as e:
         logger.error(f"Metrics collection failed: {e}")
-        error_response = ErrorResponse(error="Metrics collection failed")
-        return jsonify(error_response.dict()), 500
+        error_response = ErrorResponse.model_construct(error="Metrics collection failed")
+        return jsonify(error_response.model_dump()), 500
 
 
 @health_bp.route('/ready', methods=['GET'])
@@ -197,12 +221,12 @@ def readiness_check():
         critical_checks = []
         
         # File system must be writable
-        file_errors = file_service.validate_file_permissions()
+        file_errors = _cached_file_permission_errors()
         if file_errors:
             critical_checks.extend(file_errors)
         
         # FFmpeg must be available
-        if not ffmpeg_service.validate_ffmpeg_availability():
+        if not _cached_ffmpeg_available():
             critical_checks.append("FFmpeg not available")
         
         if critical_checks:
@@ -236,6 +260,25 @@ def liveness_check():
         return jsonify({'status': 'dead', 'error': str(e)}), 503
 
 
+@lru_cache(maxsize=1)
+def _configuration_metrics() -> dict:
+    """
+    Configuration section of the metrics response
+    
+    Settings are fixed for the lifetime of the process, so this is built once.
+    
+    Returns:
+        Dictionary of configuration values
+    """
+    return {
+        'audio_workers': settings.audio_analysis_workers,
+        'transcription_workers': settings.transcription_workers,
+        'subtitles_enabled': settings.enable_subtitles,
+        'output_directory': settings.output_dir,
+        'cleanup_interval': settings.cleanup_interval
+    }
+
+
 def _validate_configuration() -> list:
     """
     Validate configuration settings
@@ -244,6 +287,7 @@ def _validate_configuration() -> list:
         List of configuration issues
     """
     issues = []
+    output_dir = settings.output_dir
     
     # Check required settings
     if settings.audio_analysis_workers < 1:
@@ -255,23 +299,17 @@ def _validate_configuration() -> list:
     if settings.ffmpeg_timeout < 60:
         issues.append("FFmpeg timeout too low (minimum 60 seconds)")
     
-    if not settings.output_dir:
+    if not output_dir:
         issues.append("Output directory not configured")
     
-    # Check Whisper availability
-    if settings.enable_subtitles:
-        try:
-            from ..services.whisper_python_service import WhisperPythonService
-            whisper_service = WhisperPythonService()
-            if not whisper_service.is_available():
-                issues.append("Python Whisper not available but subtitles enabled")
-        except ImportError:
-            issues.append("Python Whisper dependencies not installed")
+    # Check Whisper availability (reuse the transcription service's instance)
+    if settings.enable_subtitles and not transcription_service.whisper_service.is_available():
+        issues.append("Python Whisper not available but subtitles enabled")
     
     # Check disk space (warning if less than 1GB free)
     import shutil
     try:
-        free_space = shutil.disk_usage(settings.output_dir).free
+        free_space = shutil.disk_usage(output_dir).free
         free_gb = free_space / (1024**3)
         if free_gb < 1:
             issues.append(f"Low disk space: {free_gb:.1f}GB free")
@@ -1,12 +1,14 @@
 """
 Video generation REST API controller
 """
-import uuid
 import os
-import tempfile
-from typing import Dict, Any, List
+import re
+import secrets
+import logging
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from flask import Blueprint, request, jsonify, send_file
-from pydantic import ValidationError
+from werkzeug.wsgi import FileWrapper
+from pydantic import TypeAdapter, ValidationError
 from ..models.video_config import VideoConfig
 from ..models.response_models import (
     VideoGenerationResponse, 
@@ -15,11 +17,11 @@ from ..models.response_models import (
     AudioAnalysisResult
 )
 from ..services import (
-    AudioService, 
-    TranscriptionService, 
-    SubtitleService, 
-    FFmpegService, 
-    FileService
+    get_audio_service,
+    get_transcription_service,
+    get_subtitle_service,
+    get_ffmpeg_service,
+    get_file_service
 )
 from ..services.file_job_service import job_service, JobStatus
 from ..config.logging_config import get_logger
@@ -28,7 +30,8 @@ from ..middleware.auth_middleware import require_api_key
 from ..exceptions.custom_exceptions import (
     VideoGeneratorException,
     ValidationError as CustomValidationError,
-    ConfigurationError
+    ConfigurationError,
+    ServiceUnavailableError
 )
 
 logger = get_logger(__name__)
@@ -36,12 +39,55 @@ logger = get_logger(__name__)
 # Create blueprint
 video_bp = Blueprint('video', __name__)
 
-# Initialize services
-audio_service = AudioService()
-transcription_service = TranscriptionService()
-subtitle_service = SubtitleService()
-ffmpeg_service = FFmpegService()
-file_service = FileService()
+# Serializes a whole list of audio results in one call into pydantic-core
+_AUDIO_INFO_ADAPTER = TypeAdapter(List[AudioAnalysisResult])
+
+# Canonical UUID format used for job and video IDs
+_UUID_RE = re.compile(
+    r'\A[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\Z',
+    re.IGNORECASE
+)
+
+# Block size for streaming downloads when the server has no file wrapper
+_DOWNLOAD_BUFFER_SIZE = 1024 * 1024
+
+
+def _large_buffer_file_wrapper(file, buffer_size: int = 8192) -> FileWrapper:
+    """Werkzeug FileWrapper that ignores the 8KB default block size"""
+    return FileWrapper(file, _DOWNLOAD_BUFFER_SIZE)
+
+
+# Shared service instances
+audio_service = get_audio_service()
+transcription_service = get_transcription_service()
+subtitle_service = get_subtitle_service()
+ffmpeg_service = get_ffmpeg_service()
+file_service = get_file_service()
+
+
+def _encode_progress_reporter(job_id: str, output_duration: float) -> Callable[[float], None]:
+    """
+    Build an FFmpeg progress callback that advances the job from 70% to 94%
+    
+    Args:
+        job_id: Job ID for tracking
+        output_duration: Length of the video being encoded in seconds
+        
+    Returns:
+        Callback taking the number of seconds encoded so far
+    """
+    last_progress = 70
+    
+    def report(encoded_seconds: float) -> None:
+        nonlocal last_progress
+        fraction = min(encoded_seconds / output_duration, 1.0) if output_duration > 0 else 0.0
+        progress = 70 + int(fraction * 24)
+        # Only touch the job store when the percentage actually moves
+        if progress > last_progress:
+            last_progress = progress
+            job_service.update_job_progress(job_id, progress, "Generating video with FFmpeg")
+    
+    return report
 
 
 def _process_video_generation(job_id: str, config: VideoConfig, request_id: str) -> Dict[str, Any]:
@@ -56,6 +102,9 @@ def _process_video_generation(job_id: str, config: VideoConfig, request_id: str)
     Returns:
         Result dictionary
     """
+    output_dir = settings.output_dir
+    subtitles_enabled = settings.enable_subtitles
+    
     try:
         # Update job progress
         job_service.update_job_progress(job_id, 10, "Analyzing audio files")
@@ -73,11 +122,10 @@ def _process_video_generation(job_id: str, config: VideoConfig, request_id: str)
         # Generate unique video ID and paths
         video_id = job_id  # Use job_id as video_id
         output_filename = f"{video_id}.mp4"
-        output_path = os.path.join(settings.output_dir, output_filename)
+        output_path = os.path.join(output_dir, output_filename)
         
-        # Create temporary directory for processing
-        temp_dir = tempfile.mkdtemp()
-        temp_files = [temp_dir]
+        # Create working directory inside the worker's scratch area
+        temp_dir = file_service.create_scratch_dir(job_id)
         
         try:
             # Calculate scene timings
@@ -87,22 +135,12 @@ def _process_video_generation(job_id: str, config: VideoConfig, request_id: str)
             subtitle_file_path = None
             transcription_count = 0
             
-            if settings.enable_subtitles and config.get_subtitle_element():
+            if subtitles_enabled and config.get_subtitle_element():
                 job_service.update_job_progress(job_id, 30, "Transcribing audio")
                 logger.info(f"[{request_id}] Starting transcription...")
                 
-                # Convert audio_info to dict format for transcription service
-                audio_info_dict = [
-                    {
-                        'scene_index': info.scene_index,
-                        'url': info.url,
-                        'duration': info.duration
-                    }
-                    for info in audio_info
-                ]
-                
                 transcriptions = transcription_service.transcribe_scene_audios(
-                    config, audio_info_dict, scene_timings, temp_dir
+                    config, audio_info, scene_timings, temp_dir
                 )
                 
                 if transcriptions:
@@ -113,7 +151,6 @@ def _process_video_generation(job_id: str, config: VideoConfig, request_id: str)
                     )
                     
                     if subtitle_file_path:
-                        temp_files.append(subtitle_file_path)
                         transcription_count = sum(1 for t in transcriptions if t.success)
                         logger.info(f"[{request_id}] Subtitles generated: {transcription_count} scenes transcribed")
             
@@ -121,17 +158,21 @@ def _process_video_generation(job_id: str, config: VideoConfig, request_id: str)
             job_service.update_job_progress(job_id, 60, "Preparing video generation")
             logger.info(f"[{request_id}] Generating FFmpeg command...")
             ffmpeg_cmd = ffmpeg_service.generate_ffmpeg_command(
-                config, audio_info, output_path, subtitle_file_path
+                config, audio_info, output_path, subtitle_file_path, temp_dir
             )
             
             # Execute FFmpeg
             job_service.update_job_progress(job_id, 70, "Generating video with FFmpeg")
             logger.info(f"[{request_id}] Executing FFmpeg...")
-            ffmpeg_service.execute_ffmpeg_command(ffmpeg_cmd)
+            ffmpeg_service.execute_ffmpeg_command(
+                ffmpeg_cmd, _encode_progress_reporter(job_id, total_duration + 2)
+            )
+            file_service.invalidate_video_file_info(video_id)
             
             # Get output file size
             job_service.update_job_progress(job_id, 95, "Finalizing video")
-            output_size_mb = file_service.get_video_file_info(video_id)['size_mb'] if os.path.exists(output_path) else 0
+            output_info = file_service.get_video_file_info(video_id)
+            output_size_mb = output_info['size_mb'] if output_info['exists'] else 0
             
             logger.info(f"[{request_id}] Video generated successfully: {output_filename} ({output_size_mb}MB)")
             
@@ -140,17 +181,17 @@ def _process_video_generation(job_id: str, config: VideoConfig, request_id: str)
                 'success': True,
                 'video_id': video_id,
                 'download_url': f'/download/{video_id}',
-                'audio_analysis': [a.model_dump() for a in audio_info],
+                'audio_analysis': _AUDIO_INFO_ADAPTER.dump_python(audio_info),
                 'total_duration': total_duration + 2,  # Include buffer
-                'ffmpeg_command': ' '.join(ffmpeg_cmd),
+                'ffmpeg_command': ' '.join(ffmpeg_cmd) if settings.is_development else None,
                 'output_size_mb': output_size_mb,
                 'subtitle_enabled': subtitle_file_path is not None,
                 'transcription_count': transcription_count
             }
             
         finally:
-            # Clean up temporary files
-            file_service.cleanup_temp_files(temp_files)
+            # Clean up the job's working directory
+            file_service.remove_scratch_dir(temp_dir)
             
     except Exception as e:
         logger.error(f"[{request_id}] Video generation failed: {e}")
@@ -166,12 +207,20 @@ def generate_video_async():
     Returns:
         JSON response with job ID for status tracking
     """
-    request_id = str(uuid.uuid4())[:8]
+    request_id = secrets.token_hex(4)
     logger.info(f"[{request_id}] Async video generation request received")
     
     try:
         # Parse and validate input
-        config = _parse_video_config(request.get_json(force=True))
+        config, config_error = _parse_video_config(request.get_json(force=True, silent=True))
+        if config_error:
+            logger.warning(f"[{request_id}] Invalid configuration: {config_error}")
+            error_response = ErrorResponse.model_construct(
+                error="Invalid configuration",
+                details=config_error,
+                request_id=request_id
+            )
+            return jsonify(error_response.model_dump()), 400
         logger.info(f"[{request_id}] Configuration validated successfully")
         
         # Create job and submit for background processing
@@ -192,16 +241,25 @@ def generate_video_async():
     
     except ValidationError as e:
         logger.warning(f"[{request_id}] Validation error: {e}")
-        error_response = ErrorResponse(
+        error_response = ErrorResponse.model_construct(
             error="Invalid configuration",
             details=str(e),
             request_id=request_id
         )
         return jsonify(error_response.model_dump()), 400
     
+    except ServiceUnavailableError as e:
+        logger.warning(f"[{request_id}] Job rejected: {e}")
+        error_response = ErrorResponse.model_construct(
+            error=e.message,
+            details=str(e.details),
+            request_id=request_id
+        )
+        return jsonify(error_response.model_dump()), 503, {'Retry-After': '30'}
+    
     except Exception as e:
         logger.error(f"[{request_id}] Unexpected error: {e}", exc_info=True)
-        error_response = ErrorResponse(
+        error_response = ErrorResponse.model_construct(
             error="Internal server error",
             details=str(e) if settings.is_development else None,
             request_id=request_id
@@ -222,24 +280,24 @@ def check_job_status(job_id: str):
         JSON response with job status
     """
     try:
-        logger.debug(f"Status check for job: {job_id}")
+        logger.debug("Status check for job: %s", job_id)
         
         # Validate job ID format
         if not _is_valid_uuid(job_id):
-            error_response = ErrorResponse(error="Invalid job ID format")
+            error_response = ErrorResponse.model_construct(error="Invalid job ID format")
             return jsonify(error_response.model_dump()), 400
         
         # Get job status
         job_status = job_service.get_job_status(job_id)
         
         if not job_status:
-            error_response = ErrorResponse(error="Job not found")
+            error_response = ErrorResponse.model_construct(error="Job not found")
             return jsonify(error_response.model_dump()), 404
         
         # Add file info if completed
         if job_status['status'] == 'completed':
             file_info = file_service.get_video_file_info(job_id)
-            if file_info and file_info['exists']:
+            if file_info['exists']:
                 job_status['file_size_mb'] = file_info['size_mb']
                 job_status['file_created'] = file_info['created_timestamp']
         
@@ -247,7 +305,7 @@ def check_job_status(job_id: str):
         
     except Exception as e:
         logger.error(f"Error checking job status {job_id}: {e}")
-        error_response = ErrorResponse(error="Status check failed")
+        error_response = ErrorResponse.model_construct(error="Status check failed")
         return jsonify(error_response.model_dump()), 500
 
 
@@ -271,7 +329,7 @@ def list_jobs():
             try:
                 job_status = JobStatus(status)
             except ValueError:
-                error_response = ErrorResponse(
+                error_response = ErrorResponse.model_construct(
                     error="Invalid status filter",
                     details=f"Valid statuses: {[s.value for s in JobStatus]}"
                 )
@@ -293,7 +351,7 @@ def list_jobs():
         
     except Exception as e:
         logger.error(f"Error listing jobs: {e}")
-        error_response = ErrorResponse(error="Failed to list jobs")
+        error_response = ErrorResponse.model_construct(error="Failed to list jobs")
         return jsonify(error_response.model_dump()), 500
 
 
@@ -314,7 +372,7 @@ def cancel_job(job_id: str):
         
         # Validate job ID format
         if not _is_valid_uuid(job_id):
-            error_response = ErrorResponse(error="Invalid job ID format")
+            error_response = ErrorResponse.model_construct(error="Invalid job ID format")
             return jsonify(error_response.model_dump()), 400
         
         # Cancel job
@@ -326,7 +384,7 @@ def cancel_job(job_id: str):
                 'message': 'Job cancelled successfully'
             }), 200
         else:
-            error_response = ErrorResponse(
+            error_response = ErrorResponse.model_construct(
                 error="Cannot cancel job",
                 details="Job not found or already completed"
             )
@@ -334,7 +392,7 @@ def cancel_job(job_id: str):
         
     except Exception as e:
         logger.error(f"Error cancelling job {job_id}: {e}")
-        error_response = ErrorResponse(error="Cancellation failed")
+        error_response = ErrorResponse.model_construct(error="Cancellation failed")
         return jsonify(error_response.model_dump()), 500
 
 
@@ -355,26 +413,36 @@ def download_video(video_id: str):
         
         # Validate video ID format
         if not _is_valid_uuid(video_id):
-            error_response = ErrorResponse(error="Invalid video ID format")
+            error_response = ErrorResponse.model_construct(error="Invalid video ID format")
             return jsonify(error_response.model_dump()), 400
         
         # Get file info
         file_info = file_service.get_video_file_info(video_id)
-        if not file_info or not file_info['exists']:
-            error_response = ErrorResponse(error="Video not found")
+        if not file_info['exists']:
+            error_response = ErrorResponse.model_construct(error="Video not found")
             return jsonify(error_response.model_dump()), 404
         
-        # Send file
-        return send_file(
-            file_info['path'],
-            as_attachment=True,
-            download_name=f"generated_video_{video_id}.mp4",
-            mimetype='video/mp4'
-        )
+        # Prefer the server's own (sendfile-backed) wrapper, else stream 1MB blocks
+        request.environ.setdefault('wsgi.file_wrapper', _large_buffer_file_wrapper)
+        
+        # Send file (conditional enables Range / If-Modified-Since handling)
+        try:
+            return send_file(
+                file_info['path'],
+                as_attachment=True,
+                download_name=f"generated_video_{video_id}.mp4",
+                mimetype='video/mp4',
+                conditional=True
+            )
+        except FileNotFoundError:
+            # Deleted since it was cached (possibly by another worker)
+            file_service.invalidate_video_file_info(video_id)
+            error_response = ErrorResponse.model_construct(error="Video not found")
+            return jsonify(error_response.model_dump()), 404
         
     except Exception as e:
         logger.error(f"Error downloading video {video_id}: {e}")
-        error_response = ErrorResponse(error="Download failed")
+        error_response = ErrorResponse.model_construct(error="Download failed")
         return jsonify(error_response.model_dump()), 500
 
 
@@ -391,32 +459,32 @@ def video_status(video_id: str):
         JSON response with video status
     """
     try:
-        logger.debug(f"Status check for video: {video_id}")
+        logger.debug("Status check for video: %s", video_id)
         
         # Validate video ID format
         if not _is_valid_uuid(video_id):
-            error_response = ErrorResponse(error="Invalid video ID format")
+            error_response = ErrorResponse.model_construct(error="Invalid video ID format")
             return jsonify(error_response.model_dump()), 400
         
         # Get file info
         file_info = file_service.get_video_file_info(video_id)
         
-        if file_info and file_info['exists']:
+        if file_info['exists']:
             from datetime import datetime
-            response = VideoStatusResponse(
+            response = VideoStatusResponse.model_construct(
                 exists=True,
                 size_mb=file_info['size_mb'],
                 created=datetime.fromtimestamp(file_info['created_timestamp']),
                 download_url=f'/download/{video_id}'
             )
         else:
-            response = VideoStatusResponse(exists=False)
+            response = VideoStatusResponse.model_construct(exists=False)
         
         return jsonify(response.model_dump()), 200
         
     except Exception as e:
         logger.error(f"Error checking status for video {video_id}: {e}")
-        error_response = ErrorResponse(error="Status check failed")
+        error_response = ErrorResponse.model_construct(error="Status check failed")
         return jsonify(error_response.model_dump()), 500
 
 
@@ -433,13 +501,11 @@ def list_videos():
         # Get query parameters
         limit = min(int(request.args.get('limit', 50)), 100)  # Max 100
         
-        logger.debug(f"Listing videos (limit: {limit})")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Listing videos (limit: %d)", limit)
         
-        # Get video list
-        videos = file_service.list_video_files(limit)
-        
-        # Get disk usage
-        disk_usage = file_service.get_disk_usage()
+        # Get video list and disk usage in one directory scan
+        videos, disk_usage = file_service.list_and_measure(limit)
         
         response = {
             'videos': videos,
@@ -451,7 +517,7 @@ def list_videos():
         
     except Exception as e:
         logger.error(f"Error listing videos: {e}")
-        error_response = ErrorResponse(error="Failed to list videos")
+        error_response = ErrorResponse.model_construct(error="Failed to list videos")
         return jsonify(error_response.model_dump()), 500
 
 
@@ -472,7 +538,7 @@ def delete_video(video_id: str):
         
         # Validate video ID format
         if not _is_valid_uuid(video_id):
-            error_response = ErrorResponse(error="Invalid video ID format")
+            error_response = ErrorResponse.model_construct(error="Invalid video ID format")
             return jsonify(error_response.model_dump()), 400
         
         # Delete video
@@ -482,47 +548,42 @@ def delete_video(video_id: str):
             response = {'success': True, 'message': 'Video deleted successfully'}
             return jsonify(response), 200
         else:
-            error_response = ErrorResponse(error="Video not found or already deleted")
+            error_response = ErrorResponse.model_construct(error="Video not found or already deleted")
             return jsonify(error_response.model_dump()), 404
         
     except Exception as e:
         logger.error(f"Error deleting video {video_id}: {e}")
-        error_response = ErrorResponse(error="Deletion failed")
+        error_response = ErrorResponse.model_construct(error="Deletion failed")
         return jsonify(error_response.model_dump()), 500
 
 
-def _parse_video_config(data: Any) -> VideoConfig:
+def _parse_video_config(data: Any) -> Tuple[Optional[VideoConfig], Optional[str]]:
     """
     Parse and validate video configuration from request data
     
+    Shape problems are reported through the return value rather than raised,
+    so malformed requests are rejected without exception overhead.
+    
     Args:
         data: Raw request data
         
     Returns:
-        Validated VideoConfig object
+        Tuple of (validated VideoConfig, None) or (None, error message)
         
     Raises:
-        ValidationError: If validation fails
+        ValidationError: If Pydantic validation fails
     """
-    try:
-        # Handle array input (take first config)
-        if isinstance(data, list):
-            if not data:
-                raise ValidationError("Empty configuration array")
-            config_data = data[0]
-        else:
-            config_data = data
-        
-        if not isinstance(config_data, dict):
-            raise ValidationError("Configuration must be a JSON object")
-        
-        # Validate with Pydantic
-        return VideoConfig(**config_data)
-        
-    except ValidationError:
-        raise
-    except Exception as e:
-        raise ValidationError(f"Invalid configuration format: {e}")
+    # Handle array input (take first config)
+    if isinstance(data, list):
+        if not data:
+            return None, "Empty configuration array"
+        data = data[0]
+    
+    if not isinstance(data, dict):
+        return None, "Configuration must be a JSON object"
+    
+    # Validate with Pydantic (model_validate skips the kwargs round-trip)
+    return VideoConfig.model_validate(data), None
 
 
 def _is_valid_uuid(value: str) -> bool:
@@ -535,8 +596,4 @@ def _is_valid_uuid(value: str) -> bool:
     Returns:
         True if valid UUID format
     """
-    try:
-        uuid.UUID(value)
-        return True
-    except (ValueError, TypeError):
-        return False
\ No newline at end of file
+    return isinstance(value, str) and _UUID_RE.match(value) is not None
\ No newline at end of file
@@ -7,6 +7,7 @@ from .config.settings import settings
 from .config.logging_config import setup_logging, get_logger
 from .controllers import video_bp, health_bp
 from .middleware import register_error_handlers, register_request_middleware
+from .utils.json_utils import ORJSONProvider
 
 # Setup logging first
 setup_logging()
@@ -54,7 +55,12 @@ def configure_app(app: Flask) -> None:
     # Basic configuration
     app.config['DEBUG'] = settings.debug
     app.config['MAX_CONTENT_LENGTH'] = settings.max_content_length
-    app.config['JSON_SORT_KEYS'] = False
+    
+    # Hand video downloads to a fronting web server that honours X-Sendfile
+    app.config['USE_X_SENDFILE'] = settings.use_x_sendfile
+    
+    # Serialize JSON responses with orjson
+    app.json = ORJSONProvider(app)
     
     # Trust proxy headers when behind reverse proxy (Coolify/nginx)
     # This ensures Flask generates correct HTTPS URLs
@@ -181,12 +187,12 @@ def validate_system_requirements() -> None:
     Raises:
         SystemExit: If critical requirements are not met
     """
-    from .services import FFmpegService, FileService, TranscriptionService
+    from .services import get_ffmpeg_service, get_file_service, get_transcription_service
     
     logger.info("Validating system requirements...")
     
     # Check FFmpeg availability
-    ffmpeg_service = FFmpegService()
+    ffmpeg_service = get_ffmpeg_service()
     if not ffmpeg_service.validate_ffmpeg_availability():
         logger.error("FFmpeg not found! Please install FFmpeg to continue.")
         raise SystemExit(1)
@@ -196,15 +202,18 @@ def validate_system_requirements() -> None:
     
     # Check Whisper.cpp availability (CRITICAL)
     try:
-        transcription_service = TranscriptionService()
+        transcription_service = get_transcription_service()
         logger.info("✓ Local Whisper.cpp is available and ready")
+        
+        if settings.whisper_preload:
+            transcription_service.preload_model()
     except Exception as e:
         logger.error(f"✗ Local Whisper.cpp validation failed: {e}")
         logger.error("Please run 'setup_whisper_cpp.sh' to install Whisper.cpp")
         raise SystemExit(1)
     
     # Check file system permissions
-    file_service = FileService()
+    file_service = get_file_service()
     file_errors = file_service.validate_file_permissions()
     if file_errors:
         logger.error(f"File system validation failed: {file_errors}")
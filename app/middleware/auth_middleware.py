@@ -1,6 +1,7 @@
 """
 API Key authentication middleware
 """
+import hmac
 from functools import wraps
 from flask import request, jsonify
 from ..config.settings import settings
@@ -9,6 +10,14 @@ from ..models.response_models import ErrorResponse
 
 logger = get_logger(__name__)
 
+# Settings are immutable, so the configured key is encoded once
+_API_KEY_BYTES = settings.api_key.encode() if settings.api_key else None
+
+
+def _api_key_matches(api_key: str) -> bool:
+    """Compare a provided key with the configured one in constant time"""
+    return hmac.compare_digest(api_key.encode(), _API_KEY_BYTES)
+
 
 def require_api_key(f):
     """
@@ -41,7 +50,7 @@ def require_api_key(f):
                 details="Missing X-API-Key header"
             ).model_dump()), 401
         
-        if api_key != settings.api_key:
+        if not _api_key_matches(api_key):
             logger.warning(f"Invalid API key for {request.endpoint} from {request.remote_addr}")
             return jsonify(ErrorResponse(
                 error="Invalid API key",
@@ -67,7 +76,7 @@ def validate_api_key(api_key: str) -> bool:
     if not api_key or not settings.api_key:
         return False
     
-    return api_key == settings.api_key
+    return _api_key_matches(api_key)
 
 
 class AuthenticationError(Exception):
@@ -2,6 +2,7 @@
 Global error handling middleware
 """
 import traceback
+from datetime import datetime
 from flask import Flask, jsonify, request
 from werkzeug.exceptions import HTTPException
 from pydantic import ValidationError
@@ -12,6 +13,12 @@ from ..exceptions.custom_exceptions import VideoGeneratorException
 
 logger = get_logger(__name__)
 
+# Static error bodies; only the timestamp differs between responses
+_PAYLOAD_TOO_LARGE_ERROR = ErrorResponse(
+    error="Payload too large",
+    details=f"Maximum allowed size: {settings.max_content_length} bytes"
+).model_dump(exclude={'timestamp'})
+
 
 def register_error_handlers(app: Flask) -> None:
     """
@@ -24,7 +31,7 @@ def register_error_handlers(app: Flask) -> None:
     @app.errorhandler(ValidationError)
     def handle_validation_error(error: ValidationError):
         """Handle Pydantic validation errors"""
-        logger.warning(f"Validation error: {error}")
+        logger.warning("Validation error: %s", error)
         
         # Extract field errors
         field_errors = []
@@ -37,61 +44,58 @@ def register_error_handlers(app: Flask) -> None:
             error="Validation failed",
             details="; ".join(field_errors)
         )
-        return jsonify(error_response.dict()), 400
+        return jsonify(error_response.model_dump()), 400
     
     @app.errorhandler(VideoGeneratorException)
     def handle_video_generator_error(error: VideoGeneratorException):
         """Handle custom video generator exceptions"""
-        logger.error(f"Video generator error: {error.message}")
+        logger.error("Video generator error: %s", error.message)
         
         error_response = ErrorResponse(
             error=error.message,
             details=str(error.details) if error.details else None
         )
-        return jsonify(error_response.dict()), 500
+        return jsonify(error_response.model_dump()), 500
     
     @app.errorhandler(HTTPException)
     def handle_http_error(error: HTTPException):
         """Handle HTTP exceptions (404, 405, etc.)"""
-        logger.warning(f"HTTP error {error.code}: {error.description}")
+        logger.warning("HTTP error %s: %s", error.code, error.description)
         
         error_response = ErrorResponse(
             error=error.name,
             details=error.description
         )
-        return jsonify(error_response.dict()), error.code
+        return jsonify(error_response.model_dump()), error.code
     
     @app.errorhandler(413)
     def handle_payload_too_large(error):
         """Handle payload too large errors"""
-        logger.warning(f"Payload too large: {request.content_length} bytes")
+        logger.warning("Payload too large: %s bytes", request.content_length)
         
-        error_response = ErrorResponse(
-            error="Payload too large",
-            details=f"Maximum allowed size: {settings.max_content_length} bytes"
-        )
-        return jsonify(error_response.dict()), 413
+        return jsonify({**_PAYLOAD_TOO_LARGE_ERROR, 'timestamp': datetime.utcnow()}), 413
     
     @app.errorhandler(500)
     def handle_internal_error(error):
         """Handle internal server errors"""
-        logger.error(f"Internal server error: {error}", exc_info=True)
+        logger.error("Internal server error: %s", error, exc_info=True)
         
-        # Include stack trace in development
+        # The log record above already carries the traceback; only render it
+        # again when the client will see it
         details = None
-        if settings.is_development:
+        if settings.is_development and settings.return_traceback_in_response:
             details = traceback.format_exc()
         
         error_response = ErrorResponse(
             error="Internal server error",
             details=details
         )
-        return jsonify(error_response.dict()), 500
+        return jsonify(error_response.model_dump()), 500
     
     @app.errorhandler(Exception)
     def handle_unexpected_error(error: Exception):
         """Handle unexpected exceptions"""
-        logger.error(f"Unexpected error: {error}", exc_info=True)
+        logger.error("Unexpected error: %s", error, exc_info=True)
         
         # Include error details in development
         details = str(error) if settings.is_development else "An unexpected error occurred"
@@ -100,6 +104,6 @@ def register_error_handlers(app: Flask) -> None:
             error="Unexpected error",
             details=details
         )
-        return jsonify(error_response.dict()), 500
+        return jsonify(error_response.model_dump()), 500
     
     logger.info("Error handlers registered successfully")
\ No newline at end of file
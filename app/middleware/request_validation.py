@@ -2,6 +2,7 @@
 Request validation and preprocessing middleware
 """
 import time
+from datetime import datetime
 from flask import Flask, request, g, jsonify
 from werkzeug.exceptions import BadRequest
 from ..models.response_models import ErrorResponse
@@ -10,6 +11,33 @@ from ..config.settings import settings
 
 logger = get_logger(__name__)
 
+# Liveness probes and browser favicon lookups skip request tracking
+_UNTRACKED_PATHS = frozenset({'/favicon.ico', '/health'})
+
+# Headers added to every response; settings are frozen, so the development
+# CORS variant can be chosen once at import
+_SECURITY_HEADERS = (
+    ('X-Content-Type-Options', 'nosniff'),
+    ('X-Frame-Options', 'DENY'),
+    ('X-XSS-Protection', '1; mode=block')
+)
+_CORS_HEADERS = (
+    ('Access-Control-Allow-Origin', '*'),
+    ('Access-Control-Allow-Methods', 'GET, POST, DELETE, OPTIONS'),
+    ('Access-Control-Allow-Headers', 'Content-Type, X-Request-ID')
+)
+_RESPONSE_HEADERS = _SECURITY_HEADERS + _CORS_HEADERS if settings.is_development else _SECURITY_HEADERS
+
+# Static rejection bodies; only the timestamp differs between requests
+_CONTENT_TYPE_ERROR = ErrorResponse(
+    error="Invalid content type",
+    details="Content-Type must be application/json"
+).model_dump(exclude={'timestamp'})
+_CONTENT_TOO_LARGE_ERROR = ErrorResponse(
+    error="Content too large",
+    details=f"Maximum size: {settings.max_content_length} bytes"
+).model_dump(exclude={'timestamp'})
+
 
 def register_request_middleware(app: Flask) -> None:
     """
@@ -22,64 +50,49 @@ def register_request_middleware(app: Flask) -> None:
     @app.before_request
     def before_request():
         """Process requests before they reach route handlers"""
-        # Record request start time
-        g.start_time = time.time()
+        if request.path in _UNTRACKED_PATHS:
+            return None
+        
+        # Record request start time (monotonic, immune to clock changes)
+        g.start_ns = time.perf_counter_ns()
         
         # Generate request ID for tracking
         g.request_id = request.headers.get('X-Request-ID', 'unknown')
         
         # Log incoming request
-        logger.info(
-            f"[{g.request_id}] {request.method} {request.path} "
-            f"from {request.remote_addr}"
-        )
+        logger.info("[%s] %s %s from %s", g.request_id, request.method, request.path, request.remote_addr)
         
         # Validate content type for POST requests
-        if request.method == 'POST' and request.path != '/health':
+        if request.method == 'POST':
             if not request.is_json and not request.content_type:
-                logger.warning(f"[{g.request_id}] Missing or invalid content type")
-                error_response = ErrorResponse(
-                    error="Invalid content type", 
-                    details="Content-Type must be application/json"
-                )
-                return jsonify(error_response.dict()), 400
+                logger.warning("[%s] Missing or invalid content type", g.request_id)
+                return jsonify({**_CONTENT_TYPE_ERROR, 'timestamp': datetime.utcnow()}), 400
         
         # Check content length
-        if request.content_length and request.content_length > settings.max_content_length:
-            logger.warning(f"[{g.request_id}] Content too large: {request.content_length} bytes")
-            error_response = ErrorResponse(
-                error="Content too large",
-                details=f"Maximum size: {settings.max_content_length} bytes"
-            )
-            return jsonify(error_response.dict()), 413
+        content_length = request.content_length
+        if content_length and content_length > settings.max_content_length:
+            logger.warning("[%s] Content too large: %s bytes", g.request_id, content_length)
+            return jsonify({**_CONTENT_TOO_LARGE_ERROR, 'timestamp': datetime.utcnow()}), 413
     
     @app.after_request
     def after_request(response):
         """Process responses after route handlers complete"""
         # Calculate request duration
-        if hasattr(g, 'start_time'):
-            duration = time.time() - g.start_time
+        start_ns = g.get('start_ns')
+        if start_ns is not None:
+            duration = (time.perf_counter_ns() - start_ns) / 1e9
             
             # Add duration header
             response.headers['X-Response-Time'] = f"{duration:.3f}s"
             
             # Log response
             logger.info(
-                f"[{getattr(g, 'request_id', 'unknown')}] "
-                f"{response.status_code} {request.method} {request.path} "
-                f"({duration:.3f}s)"
+                "[%s] %d %s %s (%.3fs)",
+                g.get('request_id', 'unknown'), response.status_code, request.method, request.path, duration
             )
         
-        # Add security headers
-        response.headers['X-Content-Type-Options'] = 'nosniff'
-        response.headers['X-Frame-Options'] = 'DENY'
-        response.headers['X-XSS-Protection'] = '1; mode=block'
-        
-        # Add CORS headers if needed
-        if settings.is_development:
-            response.headers['Access-Control-Allow-Origin'] = '*'
-            response.headers['Access-Control-Allow-Methods'] = 'GET, POST, DELETE, OPTIONS'
-            response.headers['Access-Control-Allow-Headers'] = 'Content-Type, X-Request-ID'
+        # Add security headers (and CORS headers in development)
+        response.headers.update(_RESPONSE_HEADERS)
         
         return response
     
@@ -112,7 +125,7 @@ def validate_json_request() -> dict:
         return data
         
     except Exception as e:
-        logger.warning(f"JSON validation failed: {e}")
+        logger.warning("JSON validation failed: %s", e)
         raise BadRequest(f"Invalid JSON: {e}")
 
 
@@ -133,6 +146,7 @@ def get_request_duration() -> float:
     Returns:
         Duration in seconds
     """
-    if hasattr(g, 'start_time'):
-        return time.time() - g.start_time
+    start_ns = g.get('start_ns')
+    if start_ns is not None:
+        return (time.perf_counter_ns() - start_ns) / 1e9
     return 0.0
\ No newline at end of file
@@ -1,10 +1,13 @@
 """
 API Response models
 """
+from functools import cached_property
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field
 from datetime import datetime
 
+from ..utils.time_utils import format_ass_time
+
 
 class AudioAnalysisResult(BaseModel):
     """Result of audio duration analysis"""
@@ -20,7 +23,7 @@ class VideoGenerationResponse(BaseModel):
     download_url: str
     audio_analysis: List[AudioAnalysisResult]
     total_duration: float = Field(ge=0)
-    ffmpeg_command: str
+    ffmpeg_command: Optional[str] = None  # Only populated in development
     output_size_mb: float = Field(ge=0)
     subtitle_enabled: bool = Field(default=False)
     transcription_count: int = Field(default=0, ge=0)
@@ -57,21 +60,15 @@ class SceneTiming(BaseModel):
     end_time: float = Field(ge=0)
     duration: float = Field(ge=0)
     
-    @property
+    @cached_property
     def formatted_start_time(self) -> str:
-        """Format start time as HH:MM:SS.SS"""
-        hours = int(self.start_time // 3600)
-        minutes = int((self.start_time % 3600) // 60)
-        seconds = self.start_time % 60
-        return f"{hours}:{minutes:02d}:{seconds:05.2f}"
+        """Format start time as H:MM:SS.CC"""
+        return format_ass_time(self.start_time)
     
-    @property
+    @cached_property
     def formatted_end_time(self) -> str:
-        """Format end time as HH:MM:SS.SS"""
-        hours = int(self.end_time // 3600)
-        minutes = int((self.end_time % 3600) // 60)
-        seconds = self.end_time % 60
-        return f"{hours}:{minutes:02d}:{seconds:05.2f}"
+        """Format end time as H:MM:SS.CC"""
+        return format_ass_time(self.end_time)
 
 
 class TranscriptionResult(BaseModel):
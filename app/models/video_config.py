@@ -1,12 +1,16 @@
 """
 Pydantic models for video configuration validation
 """
-from typing import List, Optional, Dict, Any, Literal
-from pydantic import BaseModel, HttpUrl, Field, validator
+from typing import Annotated, List, Optional, Dict, Any, Literal, Union, Callable
+from pydantic import (
+    BaseModel, ConfigDict, HttpUrl, Field, Discriminator, Tag, PrivateAttr, StringConstraints, model_validator
+)
 
 
 class SubtitleSettings(BaseModel):
     """Subtitle styling configuration"""
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+    
     style: str = Field(default="progressive")  # "progressive" | "classic"
     font_family: str = Field(default="Arial", alias="font-family")
     font_size: int = Field(default=24, alias="font-size", ge=10, le=200)
@@ -18,13 +22,12 @@ class SubtitleSettings(BaseModel):
     position: str = Field(default="center-top")
     outline_color: str = Field(default="#000000", alias="outline-color")
     outline_width: int = Field(default=3, alias="outline-width", ge=0, le=10)
-    
-    class Config:
-        allow_population_by_field_name = True
 
 
 class VideoElement(BaseModel):
     """Background video element"""
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+    
     type: Literal["video"]
     src: str
     z_index: Optional[int] = Field(default=-1, alias="z-index")
@@ -35,6 +38,8 @@ class VideoElement(BaseModel):
 
 class SubtitleElement(BaseModel):
     """Subtitle element"""
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+    
     id: Optional[str] = None
     type: Literal["subtitles"]
     settings: SubtitleSettings
@@ -43,6 +48,8 @@ class SubtitleElement(BaseModel):
 
 class ImageElement(BaseModel):
     """Scene image element"""
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+    
     type: Literal["image"]
     src: str
     x: int = Field(ge=0)
@@ -51,76 +58,106 @@ class ImageElement(BaseModel):
 
 class AudioElement(BaseModel):
     """Scene audio element"""
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+    
     type: Literal["audio"]
-    src: str
+    src: Annotated[str, StringConstraints(strip_whitespace=True, min_length=10)]
+
+
+def _element_type(*known_types: str) -> Callable[[Any], str]:
+    """
+    Build a discriminator that routes elements by their "type" field
+    
+    Args:
+        known_types: Types with a dedicated element model
+        
+    Returns:
+        Callable returning the element's type, or "other" for unknown types
+    """
+    def discriminate(element: Any) -> str:
+        if isinstance(element, dict):
+            element_type = element.get('type')
+        else:
+            element_type = getattr(element, 'type', None)
+        return element_type if element_type in known_types else 'other'
+    return discriminate
+
+
+# Unknown elements are kept as-is for backwards compatibility
+SceneElement = Annotated[
+    Union[
+        Annotated[ImageElement, Tag('image')],
+        Annotated[AudioElement, Tag('audio')],
+        Annotated[Any, Tag('other')]
+    ],
+    Discriminator(_element_type('image', 'audio'))
+]
+
+ConfigElement = Annotated[
+    Union[
+        Annotated[VideoElement, Tag('video')],
+        Annotated[SubtitleElement, Tag('subtitles')],
+        Annotated[Any, Tag('other')]
+    ],
+    Discriminator(_element_type('video', 'subtitles'))
+]
 
 
 class Scene(BaseModel):
     """Video scene with elements"""
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+    
     id: str
     background_color: str = Field(default="transparent", alias="background-color")
-    elements: List[Any]  # Union of ImageElement, AudioElement
-    
-    @validator('elements')
-    def validate_elements(cls, v):
-        validated = []
-        for element in v:
-            if element.get('type') == 'image':
-                validated.append(ImageElement(**element))
-            elif element.get('type') == 'audio':
-                validated.append(AudioElement(**element))
-            else:
-                # Keep unknown elements as-is for backwards compatibility
-                validated.append(element)
-        return validated
-    
-    class Config:
-        allow_population_by_field_name = True
+    elements: List[SceneElement]
 
 
 class VideoConfig(BaseModel):
     """Complete video configuration"""
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+    
     comment: Optional[str] = None
     resolution: str = Field(default="custom")
     quality: str = Field(default="high")
     width: int = Field(ge=100, le=4000)
     height: int = Field(ge=100, le=4000)
     scenes: List[Scene]
-    elements: List[Any]  # Union of VideoElement, SubtitleElement
+    elements: List[ConfigElement]
+    
+    # Element lookups, resolved once after validation
+    _background_video: Optional[VideoElement] = PrivateAttr(default=None)
+    _subtitle_element: Optional[SubtitleElement] = PrivateAttr(default=None)
+    _scenes_with_audio: List[Scene] = PrivateAttr(default_factory=list)
+    _scenes_with_images: List[Scene] = PrivateAttr(default_factory=list)
     
-    @validator('elements')
-    def validate_elements(cls, v):
-        validated = []
-        for element in v:
-            if element.get('type') == 'video':
-                validated.append(VideoElement(**element))
-            elif element.get('type') == 'subtitles':
-                validated.append(SubtitleElement(**element))
-            else:
-                # Keep unknown elements as-is for backwards compatibility
-                validated.append(element)
-        return validated
+    @model_validator(mode='after')
+    def _index_elements(self) -> 'VideoConfig':
+        """Resolve the element lookups used by the get_* helpers"""
+        for element in self.elements:
+            if self._background_video is None and isinstance(element, VideoElement):
+                self._background_video = element
+            elif self._subtitle_element is None and isinstance(element, SubtitleElement):
+                self._subtitle_element = element
+        
+        for scene in self.scenes:
+            if any(isinstance(el, AudioElement) for el in scene.elements):
+                self._scenes_with_audio.append(scene)
+            if any(isinstance(el, ImageElement) for el in scene.elements):
+                self._scenes_with_images.append(scene)
+        return self
     
     def get_background_video(self) -> Optional[VideoElement]:
         """Get the background video element"""
-        for element in self.elements:
-            if isinstance(element, VideoElement):
-                return element
-        return None
+        return self._background_video
     
     def get_subtitle_element(self) -> Optional[SubtitleElement]:
         """Get the subtitle element"""
-        for element in self.elements:
-            if isinstance(element, SubtitleElement):
-                return element
-        return None
+        return self._subtitle_element
     
     def get_scenes_with_audio(self) -> List[Scene]:
         """Get only scenes that have audio elements"""
-        return [scene for scene in self.scenes 
-                if any(isinstance(el, AudioElement) for el in scene.elements)]
+        return list(self._scenes_with_audio)
     
     def get_scenes_with_images(self) -> List[Scene]:
         """Get only scenes that have image elements"""
-        return [scene for scene in self.scenes 
-                if any(isinstance(el, ImageElement) for el in scene.elements)]
\ No newline at end of file
+        return list(self._scenes_with_images)
\ No newline at end of file
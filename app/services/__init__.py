@@ -1,12 +1,25 @@
 """
 Service layer initialization
+
+Services are imported on first attribute access (PEP 562), so importing this
+package does not pull in every service module and its dependencies.
 """
-from .audio_service import AudioService
-from .transcription_service import TranscriptionService
-from .subtitle_service import SubtitleService
-from .ffmpeg_service import FFmpegService
-from .file_service import FileService
-from .file_job_service import FileJobService
+from importlib import import_module
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'AudioService': '.audio_service',
+    'TranscriptionService': '.transcription_service',
+    'SubtitleService': '.subtitle_service',
+    'FFmpegService': '.ffmpeg_service',
+    'FileService': '.file_service',
+    'FileJobService': '.file_job_service',
+    'get_audio_service': '.registry',
+    'get_transcription_service': '.registry',
+    'get_subtitle_service': '.registry',
+    'get_ffmpeg_service': '.registry',
+    'get_file_service': '.registry'
+}
 
 __all__ = [
     'AudioService',
@@ -14,5 +27,23 @@ __all__ = [
     'SubtitleService',
     'FFmpegService',
     'FileService',
-    'FileJobService'
-]
\ No newline at end of file
+    'FileJobService',
+    'get_audio_service',
+    'get_transcription_service',
+    'get_subtitle_service',
+    'get_ffmpeg_service',
+    'get_file_service'
+]
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,28 +1,66 @@
 """
 Audio processing service for duration analysis and validation
 """
+import logging
 import subprocess
-import json
 import concurrent.futures
 import threading
-from typing import List, Tuple, Dict, Any
+import time
+from collections import OrderedDict, defaultdict
+from typing import List, Optional, Tuple, Dict, Any
+
+import orjson
+
 from ..models.video_config import VideoConfig, Scene, AudioElement
 from ..models.response_models import AudioAnalysisResult, SceneTiming
 from ..config.logging_config import get_logger
 from ..config.settings import settings
-from ..utils.url_utils import process_gdrive_url
-from ..exceptions.custom_exceptions import AudioProcessingError, TimeoutError
+from ..utils.url_utils import process_gdrive_url, resolve_redirect_url
+from ..exceptions.custom_exceptions import AudioProcessingError, TimeoutError, URLProcessingError
 
 logger = get_logger(__name__)
 
+# Upper bound on remembered audio durations (least recently used are dropped)
+_DURATION_CACHE_MAXSIZE = 4096
+
 
 class AudioService:
     """Service for audio processing and analysis"""
     
     def __init__(self):
-        self.progress_lock = threading.Lock()
-        self.completed_count = 0
-        self.total_count = 0
+        # One probe pool shared by all requests; threads are reused instead of
+        # being spawned and torn down for every analysis
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=settings.audio_analysis_workers,
+            thread_name_prefix="audio-probe"
+        )
+        
+        # url -> (expires_at, duration); only successful probes are cached
+        self._duration_cache: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._duration_cache_lock = threading.Lock()
+    
+    def _get_cached_duration(self, url: str) -> Optional[float]:
+        """Return a previously probed duration for the URL if still fresh"""
+        with self._duration_cache_lock:
+            entry = self._duration_cache.get(url)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._duration_cache[url]
+                return None
+            self._duration_cache.move_to_end(url)
+            return entry[1]
+    
+    def _cache_duration(self, url: str, duration: float) -> None:
+        """Remember a probed duration for AUDIO_DURATION_CACHE_TTL seconds"""
+        ttl = settings.audio_duration_cache_ttl
+        if ttl <= 0:
+            return
+        with self._duration_cache_lock:
+            self._duration_cache[url] = (time.monotonic() + ttl, duration)
+            self._duration_cache.move_to_end(url)
+            while len(self._duration_cache) > _DURATION_CACHE_MAXSIZE:
+                self._duration_cache.popitem(last=False)
     
     def get_audio_duration(self, url: str) -> float:
         """
@@ -37,56 +75,28 @@ class AudioService:
         Raises:
             AudioProcessingError: If duration analysis fails
         """
+        cached_duration = self._get_cached_duration(url)
+        if cached_duration is not None:
+            logger.debug("Using cached duration for %s: %ss", url, cached_duration)
+            return cached_duration
+        
         try:
+            probe_url = url
+            
             # For Google Drive URLs, get the final redirect URL first
             if 'drive.google.com' in url:
-                logger.debug(f"Google Drive URL detected, following redirects...")
-                redirect_cmd = f'curl -L -s "{url}" -w "%{{url_effective}}" -o /dev/null'
-                redirect_result = subprocess.run(
-                    redirect_cmd, 
-                    shell=True, 
-                    capture_output=True, 
-                    text=True, 
-                    timeout=settings.audio_analysis_timeout
-                )
-                
-                if redirect_result.returncode == 0 and redirect_result.stdout.strip():
-                    final_url = redirect_result.stdout.strip()
-                    logger.debug(f"Final URL after redirects: {final_url}")
-                    
-                    # Try ffprobe with the final URL
-                    cmd = f'ffprobe -v quiet -print_format json -show_format "{final_url}"'
-                    result = subprocess.run(
-                        cmd, 
-                        shell=True, 
-                        capture_output=True, 
-                        text=True, 
-                        timeout=settings.audio_analysis_timeout
-                    )
-                    
-                    if result.returncode == 0:
-                        data = json.loads(result.stdout)
-                        if 'format' in data and 'duration' in data['format']:
-                            duration = float(data['format']['duration'])
-                            logger.debug(f"Got duration: {duration}s")
-                            return duration
-            else:
-                # For non-Google Drive URLs, try direct ffprobe
-                cmd = f'ffprobe -v quiet -print_format json -show_format "{url}"'
-                result = subprocess.run(
-                    cmd, 
-                    shell=True, 
-                    capture_output=True, 
-                    text=True, 
-                    timeout=settings.audio_analysis_timeout
-                )
-                
-                if result.returncode == 0:
-                    data = json.loads(result.stdout)
-                    if 'format' in data and 'duration' in data['format']:
-                        duration = float(data['format']['duration'])
-                        logger.debug(f"Got duration: {duration}s")
-                        return duration
+                logger.debug("Google Drive URL detected, following redirects...")
+                try:
+                    probe_url = resolve_redirect_url(url)
+                except URLProcessingError:
+                    # ffprobe follows redirects itself, so try the original URL
+                    pass
+            
+            duration = self._probe_duration(probe_url)
+            if duration is not None:
+                logger.debug("Got duration: %ss", duration)
+                self._cache_duration(url, duration)
+                return duration
             
             logger.warning(f"Could not get duration for {url}, using default")
             return 10.0
@@ -98,6 +108,33 @@ class AudioService:
             logger.error(f"Exception in get_audio_duration: {e}")
             raise AudioProcessingError(f"Failed to get audio duration: {e}")
     
+    def _probe_duration(self, url: str) -> Optional[float]:
+        """
+        Read a media file's duration with ffprobe
+        
+        Args:
+            url: Media URL
+            
+        Returns:
+            Duration in seconds, or None if ffprobe could not determine it
+        """
+        # argv list: no shell, and the URL is never interpreted by one.
+        # Only the duration is requested, not the full format/tag dump.
+        result = subprocess.run(
+            ['ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_entries', 'format=duration', url],
+            capture_output=True,
+            timeout=settings.audio_analysis_timeout
+        )
+        
+        if result.returncode != 0:
+            return None
+        
+        # orjson parses the raw bytes; no decode pass needed
+        data = orjson.loads(result.stdout)
+        if 'format' in data and 'duration' in data['format']:
+            return float(data['format']['duration'])
+        return None
+    
     def analyze_audio_durations(self, config: VideoConfig) -> Tuple[List[AudioAnalysisResult], float]:
         """
         Analyze all audio files concurrently and return their durations
@@ -131,44 +168,42 @@ class AudioService:
             
             logger.info(f"Analyzing {len(audio_tasks)} audio files concurrently...")
             
-            # Reset progress tracking
-            with self.progress_lock:
-                self.completed_count = 0
-                self.total_count = len(audio_tasks)
-            
             # Process audio durations concurrently
             audio_results = []
             total_duration = 0
+            total_count = len(audio_tasks)
+            completed_count = 0
             
-            with concurrent.futures.ThreadPoolExecutor(max_workers=settings.audio_analysis_workers) as executor:
-                # Submit all tasks
-                future_to_task = {
-                    executor.submit(self._get_duration_with_info, task): task 
-                    for task in audio_tasks
-                }
+            # Probe each distinct URL once; scenes reusing an audio file (and
+            # its Drive redirect lookup) share the result
+            future_to_tasks: Dict[concurrent.futures.Future, List[Dict[str, Any]]] = {}
+            url_futures: Dict[str, concurrent.futures.Future] = {}
+            for task in audio_tasks:
+                future = url_futures.get(task['url'])
+                if future is None:
+                    future = self.executor.submit(self.get_audio_duration, task['url'])
+                    url_futures[task['url']] = future
+                future_to_tasks.setdefault(future, []).append(task)
+            
+            # Results are collected on this thread only, so progress is a
+            # plain local counter and concurrent requests don't share it
+            for future in concurrent.futures.as_completed(future_to_tasks):
+                try:
+                    duration = future.result(timeout=60)  # 60 second timeout per audio
+                except Exception as e:
+                    logger.error(f"✗ Failed to analyze {future_to_tasks[future][0]['url']}: {e}")
+                    duration = 10.0  # Default duration
+                else:
+                    completed_count += len(future_to_tasks[future])
+                    logger.info(f"✓ Audio {completed_count}/{total_count}: {duration}s")
                 
-                # Collect results as they complete
-                for future in concurrent.futures.as_completed(future_to_task):
-                    try:
-                        result = future.result(timeout=60)  # 60 second timeout per audio
-                        audio_results.append(result)
-                        total_duration += result.duration
-                        
-                        with self.progress_lock:
-                            self.completed_count += 1
-                            logger.info(f"✓ Audio {self.completed_count}/{self.total_count}: {result.duration}s")
-                            
-                    except Exception as e:
-                        task = future_to_task[future]
-                        logger.error(f"✗ Failed to analyze {task['url']}: {e}")
-                        # Add with default duration
-                        result = AudioAnalysisResult(
-                            scene_index=task['scene_index'],
-                            url=task['url'],
-                            duration=10.0
-                        )
-                        audio_results.append(result)
-                        total_duration += 10.0
+                for task in future_to_tasks[future]:
+                    audio_results.append(AudioAnalysisResult(
+                        scene_index=task['scene_index'],
+                        url=task['url'],
+                        duration=duration
+                    ))
+                    total_duration += duration
             
             # Sort by scene_index to maintain order
             audio_results.sort(key=lambda x: x.scene_index)
@@ -180,23 +215,6 @@ class AudioService:
             logger.error(f"Failed to analyze audio durations: {e}")
             raise AudioProcessingError(f"Audio duration analysis failed: {e}")
     
-    def _get_duration_with_info(self, task: Dict[str, Any]) -> AudioAnalysisResult:
-        """
-        Get duration with task information (for concurrent processing)
-        
-        Args:
-            task: Task dictionary with scene_index and url
-            
-        Returns:
-            AudioAnalysisResult with duration information
-        """
-        duration = self.get_audio_duration(task['url'])
-        return AudioAnalysisResult(
-            scene_index=task['scene_index'],
-            url=task['url'],
-            duration=duration
-        )
-    
     def calculate_scene_timings(self, audio_results: List[AudioAnalysisResult]) -> List[SceneTiming]:
         """
         Calculate timing information for each scene based on audio durations
@@ -209,12 +227,9 @@ class AudioService:
         """
         try:
             # Group audio durations by scene
-            scene_audio_durations = {}
+            scene_audio_durations = defaultdict(float)
             for result in audio_results:
-                scene_idx = result.scene_index
-                if scene_idx not in scene_audio_durations:
-                    scene_audio_durations[scene_idx] = 0
-                scene_audio_durations[scene_idx] += result.duration
+                scene_audio_durations[result.scene_index] += result.duration
             
             # Calculate start/end times for each scene
             scene_timings = []
@@ -222,7 +237,8 @@ class AudioService:
             
             for scene_idx in sorted(scene_audio_durations.keys()):
                 duration = scene_audio_durations[scene_idx]
-                scene_timing = SceneTiming(
+                # Values derive from validated, non-negative durations
+                scene_timing = SceneTiming.model_construct(
                     scene_index=scene_idx,
                     start_time=current_time,
                     end_time=current_time + duration,
@@ -231,32 +247,14 @@ class AudioService:
                 scene_timings.append(scene_timing)
                 current_time += duration
                 
-                logger.debug(f"Scene {scene_idx}: {scene_timing.formatted_start_time} - {scene_timing.formatted_end_time}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "Scene %s: %s - %s",
+                        scene_idx, scene_timing.formatted_start_time, scene_timing.formatted_end_time
+                    )
             
             return scene_timings
             
         except Exception as e:
             logger.error(f"Failed to calculate scene timings: {e}")
             raise AudioProcessingError(f"Scene timing calculation failed: {e}")
-    
-    def validate_audio_urls(self, config: VideoConfig) -> List[str]:
-        """
-        Validate all audio URLs in configuration
-        
-        Args:
-            config: Video configuration
-            
-        Returns:
-            List of validation errors (empty if all valid)
-        """
-        errors = []
-        
-        for i, scene in enumerate(config.scenes):
-            for j, element in enumerate(scene.elements):
-                if isinstance(element, AudioElement):
-                    if not element.src or not element.src.strip():
-                        errors.append(f"Scene {i}, element {j}: Empty audio URL")
-                    elif len(element.src) < 10:
-                        errors.append(f"Scene {i}, element {j}: Audio URL too short")
-        
-        return errors
\ No newline at end of file
@@ -0,0 +1,172 @@
+"""
+faster-whisper transcription service with batched inference
+"""
+import os
+import threading
+
+try:
+    from faster_whisper import WhisperModel, BatchedInferencePipeline
+    FASTER_WHISPER_AVAILABLE = True
+except ImportError:
+    FASTER_WHISPER_AVAILABLE = False
+    WhisperModel = None
+    BatchedInferencePipeline = None
+
+from ..config.logging_config import get_logger
+from ..config.settings import settings
+from ..exceptions.custom_exceptions import TranscriptionError
+
+logger = get_logger(__name__)
+
+
+class FasterWhisperService:
+    """Transcription service using faster-whisper's BatchedInferencePipeline"""
+    
+    def __init__(self):
+        self.model = None
+        self.pipeline = None
+        self.model_name = None
+        self.device = None
+        self.available_models = [
+            "tiny", "base", "small", "medium", "large-v1", "large-v2", "large-v3"
+        ]
+        self.lock = threading.Lock()
+        self._initialize()
+    
+    def _initialize(self) -> None:
+        """Initialize faster-whisper service"""
+        if not FASTER_WHISPER_AVAILABLE:
+            logger.warning("faster-whisper not available. Install with: pip install faster-whisper")
+            return
+        
+        # faster-whisper (CTranslate2) supports cpu and cuda only
+        device_preference = getattr(settings, 'whisper_device', 'auto')
+        self.device = device_preference if device_preference in ('cpu', 'cuda') else 'auto'
+        logger.info(f"✓ faster-whisper initialized on device: {self.device}")
+    
+    def _load_model(self, model_name: str) -> None:
+        """Load faster-whisper model if not already loaded"""
+        with self.lock:
+            if self.pipeline is not None and self.model_name == model_name:
+                return
+            
+            logger.info(f"Loading faster-whisper model: {model_name} on {self.device}")
+            
+            try:
+                download_root = getattr(settings, 'whisper_cache_dir', None)
+                if download_root:
+                    os.makedirs(download_root, exist_ok=True)
+                
+                # num_workers lets scene transcriptions run in parallel
+                self.model = WhisperModel(
+                    model_name,
+                    device=self.device,
+                    download_root=download_root,
+                    num_workers=max(1, settings.transcription_workers)
+                )
+                self.pipeline = BatchedInferencePipeline(model=self.model)
+                self.model_name = model_name
+                logger.info(f"✓ Model {model_name} loaded successfully")
+            
+            except Exception as e:
+                logger.error(f"Failed to load model {model_name}: {e}")
+                raise TranscriptionError(f"Failed to load faster-whisper model: {e}")
+    
+    def preload_model(self) -> None:
+        """Load the configured model now instead of on first transcription"""
+        if self.is_available():
+            self._load_model(self.get_best_model())
+    
+    def is_available(self) -> bool:
+        """Check if faster-whisper is available"""
+        return FASTER_WHISPER_AVAILABLE
+    
+    def get_best_model(self) -> str:
+        """Get the best available model based on settings"""
+        default_model = getattr(settings, 'whisper_python_model', 'base')
+        
+        if default_model in self.available_models:
+            return default_model
+        
+        logger.warning(f"Configured model '{default_model}' not in available models, using 'base'")
+        return 'base'
+    
+    def transcribe_url_with_words(self, audio_url: str) -> dict:
+        """
+        Transcribe audio from URL with word-level timestamps
+        
+        Args:
+            audio_url: URL to audio file
+        
+        Returns:
+            Result in the same shape as openai-whisper's transcribe()
+            (text, segments with words)
+        """
+        try:
+            logger.debug(f"Transcribing URL with faster-whisper: {audio_url}")
+            
+            if self.pipeline is None:
+                self._load_model(self.get_best_model())
+            
+            segments, _ = self.pipeline.transcribe(
+                audio_url,
+                batch_size=settings.whisper_batch_size,
+                beam_size=1,
+                temperature=0,
+                word_timestamps=True
+            )
+            
+            result_segments = []
+            for segment in segments:
+                result_segments.append({
+                    'start': segment.start,
+                    'end': segment.end,
+                    'text': segment.text,
+                    'words': [
+                        {'word': word.word, 'start': word.start, 'end': word.end}
+                        for word in (segment.words or [])
+                    ]
+                })
+            
+            logger.debug(f"URL transcription with words completed: {len(result_segments)} segments")
+            return {
+                'text': ''.join(segment['text'] for segment in result_segments),
+                'segments': result_segments
+            }
+        
+        except Exception as e:
+            logger.error(f"URL transcription with words failed for {audio_url}: {e}")
+            raise TranscriptionError(f"URL transcription with words failed: {e}")
+    
+    def transcribe_url(self, audio_url: str) -> str:
+        """
+        Transcribe audio from URL
+        
+        Args:
+            audio_url: URL to audio file
+        
+        Returns:
+            Transcription text
+        """
+        return self.transcribe_url_with_words(audio_url)['text'].strip()
+    
+    def get_info(self) -> dict:
+        """Get faster-whisper service information"""
+        return {
+            "available": self.is_available(),
+            "backend": "faster-whisper",
+            "device": self.device,
+            "available_models": self.available_models,
+            "loaded_model": self.model_name,
+            "best_model": self.get_best_model() if self.is_available() else None,
+            "batch_size": settings.whisper_batch_size
+        }
+    
+    def unload_model(self) -> None:
+        """Unload the current model to free memory"""
+        with self.lock:
+            if self.model is not None:
+                logger.info(f"Unloading model: {self.model_name}")
+                self.pipeline = None
+                self.model = None
+                self.model_name = None
@@ -1,32 +1,228 @@
 """
 FFmpeg command generation and execution service
 """
+import logging
+import os
+import re
 import subprocess
 import tempfile
 import shlex
-from typing import List, Optional, Tuple, Dict, Any
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+from itertools import accumulate
+from typing import Callable, List, Optional, Tuple, Dict, Any
 from ..models.video_config import VideoConfig, ImageElement
 from ..models.response_models import AudioAnalysisResult, SceneTiming
 from ..config.logging_config import get_logger
 from ..config.settings import settings
+from ..utils.file_utils import download_file
 from ..utils.url_utils import process_gdrive_url
-from ..exceptions.custom_exceptions import FFmpegError, ConfigurationError
+from ..exceptions.custom_exceptions import FFmpegError, ConfigurationError, FileOperationError
 
 logger = get_logger(__name__)
 
+# Leading arguments shared by every generated command; progress is reported
+# as key=value lines on stderr instead of the interactive stats line
+_COMMAND_PREFIX = (
+    'ffmpeg', '-y', '-protocol_whitelist', 'file,http,https,tcp,tls',
+    '-progress', 'pipe:2', '-nostats'
+)
+
+# A "-progress" report line such as "out_time_us=1500000"; some values
+# are space-padded ("bitrate= 512.3kbits/s", "speed= 1.2x")
+_PROGRESS_LINE_RE = re.compile(r'^[a-z0-9_]+=.*$')
+
+# Number of trailing stderr log lines kept for error reports
+_STDERR_TAIL_LINES = 200
+
+# Hardware H.264 encoders tried in order when USE_HARDWARE_ACCEL is set
+_HARDWARE_ENCODERS = ('h264_nvenc', 'h264_qsv', 'h264_videotoolbox')
+
+# Maximum parallel image downloads per command
+_IMAGE_PREFETCH_WORKERS = 8
+
+# Paths embedded in the filter graph must not contain characters the filter
+# parser treats specially (':', ',', ';', quotes, brackets, backslashes)
+_FILTER_SAFE_PATH_RE = re.compile(r'^[A-Za-z0-9/._\-]+$')
+
 
 class FFmpegService:
     """Service for FFmpeg command generation and execution"""
     
     def __init__(self):
-        pass
+        self._ffmpeg_version: Optional[str] = None
+        self.video_encoder = self._select_video_encoder()
+        self.nvenc_available = self.video_encoder == 'h264_nvenc'
+        logger.info(f"Video encoder: {self.video_encoder}")
+        
+        # Codec arguments only depend on settings and the encoder probe
+        self._input_probe_args = tuple(self._get_input_probe_args())
+        self._video_decoding_args = tuple(self._get_video_decoding_args())
+        self._video_encoding_args = tuple(self._get_video_encoding_args())
+        
+        # Bound simultaneous encodes independently of the job worker count
+        self.max_concurrent_transcodes = self._get_max_concurrent_transcodes()
+        self._transcode_slots = threading.BoundedSemaphore(self.max_concurrent_transcodes)
+        logger.info(f"FFmpeg concurrency limit: {self.max_concurrent_transcodes} encode(s)")
+    
+    def _get_max_concurrent_transcodes(self) -> int:
+        """
+        Determine how many FFmpeg encodes may run at once
+        
+        libx264 already spreads a single encode across all cores, so running
+        one per core only thrashes the caches; NVENC sessions are cheap on
+        the CPU but limited per GPU.
+        
+        Returns:
+            Maximum number of concurrent encodes
+        """
+        if settings.max_concurrent_transcodes > 0:
+            return settings.max_concurrent_transcodes
+        
+        if self.video_encoder != 'libx264':
+            return 2
+        
+        return max(1, (os.cpu_count() or 1) // 4)
+    
+    def _select_video_encoder(self) -> str:
+        """
+        Choose the H.264 encoder from VIDEO_ENCODER and USE_HARDWARE_ACCEL
+        
+        Returns:
+            A working hardware encoder if one was requested, otherwise libx264
+        """
+        if settings.video_encoder != 'auto':
+            candidates = [settings.video_encoder]
+        elif settings.use_hardware_accel:
+            candidates = list(_HARDWARE_ENCODERS)
+        else:
+            return 'libx264'
+        
+        for encoder in candidates:
+            if encoder == 'libx264' or self._check_encoder_available(encoder):
+                return encoder
+        
+        logger.warning(f"Hardware encoding requested but {', '.join(candidates)} not usable, falling back to libx264")
+        return 'libx264'
+    
+    def _check_encoder_available(self, encoder: str) -> bool:
+        """
+        Check whether FFmpeg can actually encode with a hardware encoder
+        
+        A build may list an encoder without usable hardware, so run a tiny test encode.
+        
+        Args:
+            encoder: FFmpeg encoder name, e.g. h264_nvenc
+        
+        Returns:
+            True if the encoder works on this machine
+        """
+        try:
+            result = subprocess.run(
+                [
+                    'ffmpeg', '-hide_banner', '-v', 'error',
+                    '-f', 'lavfi', '-i', 'color=c=black:s=256x256:d=0.1',
+                    '-c:v', encoder, '-f', 'null', '-'
+                ],
+                capture_output=True,
+                timeout=30
+            )
+            available = result.returncode == 0
+        except (subprocess.TimeoutExpired, FileNotFoundError):
+            available = False
+        
+        logger.info(f"{encoder} encoder {'available' if available else 'not available'}")
+        return available
+    
+    def _get_input_probe_args(self) -> List[str]:
+        """
+        Get options limiting how much of each input FFmpeg probes
+        
+        FFmpeg otherwise reads up to 5 MB / 5 s of every input before the
+        first frame; these are per-input options and must precede each -i.
+        
+        Returns:
+            List of input arguments
+        """
+        return [
+            '-probesize', settings.ffmpeg_probesize,
+            '-analyzeduration', str(settings.ffmpeg_analyzeduration)
+        ]
+    
+    def _get_video_decoding_args(self) -> List[str]:
+        """
+        Get input options for decoding the background video
+        
+        With NVENC or VideoToolbox the same hardware also decodes. Frames are
+        copied back to system memory because the overlay/ass filters run on
+        the CPU; FFmpeg falls back to software decode for unsupported codecs.
+        
+        Returns:
+            List of input arguments
+        """
+        if self.nvenc_available:
+            return ['-hwaccel', 'cuda']
+        
+        if self.video_encoder == 'h264_videotoolbox':
+            return ['-hwaccel', 'videotoolbox']
+        
+        return []
+    
+    def _get_video_encoding_args(self) -> List[str]:
+        """
+        Get video encoder arguments for the selected encoder
+        
+        VIDEO_QUALITY_CRF is translated to each encoder's constant-quality
+        option so output quality stays comparable across encoders.
+        
+        Returns:
+            List of encoder arguments
+        """
+        if self.nvenc_available:
+            return [
+                '-c:v', 'h264_nvenc',
+                '-preset', settings.nvenc_preset,
+                '-tune', 'hq',
+                '-rc', 'vbr',
+                '-cq', str(settings.video_quality_crf),
+                '-b:v', '0',
+                '-bf', '2'
+            ]
+        
+        if self.video_encoder == 'h264_qsv':
+            # QSV has no ultrafast/superfast presets
+            preset = settings.video_preset
+            if preset in ('ultrafast', 'superfast'):
+                preset = 'veryfast'
+            return [
+                '-c:v', 'h264_qsv',
+                '-preset', preset,
+                '-global_quality', str(settings.video_quality_crf)
+            ]
+        
+        if self.video_encoder == 'h264_videotoolbox':
+            # -q:v runs 1 (worst) .. 100 (best); CRF 23 maps to 54
+            quality = max(1, min(100, 100 - 2 * settings.video_quality_crf))
+            return [
+                '-c:v', 'h264_videotoolbox',
+                '-q:v', str(quality)
+            ]
+        
+        return [
+            '-c:v', 'libx264',
+            '-preset', settings.video_preset,
+            '-crf', str(settings.video_quality_crf)
+        ]
     
     def generate_ffmpeg_command(
         self, 
         config: VideoConfig, 
         audio_info: List[AudioAnalysisResult], 
         output_path: str,
-        subtitle_file_path: Optional[str] = None
+        subtitle_file_path: Optional[str] = None,
+        work_dir: Optional[str] = None
     ) -> List[str]:
         """
         Generate complete FFmpeg command for video creation
@@ -36,10 +232,12 @@ class FFmpegService:
             audio_info: Audio analysis results
             output_path: Output video file path
             subtitle_file_path: Optional ASS subtitle file path
-            
+            work_dir: Optional job working directory; when given, the filter
+                graph is written there and passed with -filter_complex_script
+        
         Returns:
             Complete FFmpeg command as list of arguments
-            
+        
         Raises:
             ConfigurationError: If configuration is invalid
             FFmpegError: If command generation fails
@@ -48,7 +246,7 @@ class FFmpegService:
             logger.info("Generating FFmpeg command...")
             
             # Validate configuration
-            self._validate_config(config, audio_info)
+            self._validate_config(config, audio_info, subtitle_file_path)
             
             # Get background video
             bg_video = config.get_background_video()
@@ -57,139 +255,318 @@ class FFmpegService:
             
             bg_url = process_gdrive_url(bg_video.src)
             
-            # Build command parts
-            cmd_parts = ['ffmpeg', '-y']
-            
-            # Add protocol whitelist for HTTPS access
-            cmd_parts.extend(['-protocol_whitelist', 'file,http,https,tcp,tls'])
+            # Build command parts (with protocol whitelist for HTTPS access)
+            cmd_parts = list(_COMMAND_PREFIX)
             
             # Calculate timing and loops
             total_duration = sum(info.duration for info in audio_info) + 2  # +2 seconds buffer
             loops_needed = self._calculate_loops(bg_video.duration, total_duration)
             
-            # Add background video with smart loop count
-            cmd_parts.extend(['-stream_loop', str(loops_needed), '-i', bg_url])
+            # Add background video with smart loop count, cut to length at the
+            # demuxer so no frames past the end are decoded or filtered
+            cmd_parts.extend(self._input_probe_args)
+            cmd_parts.extend(self._video_decoding_args)
+            cmd_parts.extend(['-stream_loop', str(loops_needed), '-t', str(total_duration), '-i', bg_url])
             
             # Add audio inputs
             audio_urls = [info.url for info in audio_info]
             for audio_url in audio_urls:
+                cmd_parts.extend(self._input_probe_args)
                 cmd_parts.extend(['-i', audio_url])
             
-            # Add image inputs
+            # Add image inputs; each distinct URL is opened once and mapped
+            # to its input index
             image_data = self._collect_image_data(config)
-            unique_image_urls = []
+            image_inputs: Dict[str, int] = {}
+            img_input_base = len(audio_urls) + 1  # First image input index
             for img in image_data:
-                if img['url'] not in unique_image_urls:
-                    unique_image_urls.append(img['url'])
-                    processed_url = process_gdrive_url(img['url'])
-                    cmd_parts.extend(['-i', processed_url])
-                    logger.debug(f"✓ Image URL added: {processed_url}")
-            
-            # Build filter complex
-            filters = []
-            current_video = '0:v'
-            
-            # Audio processing
-            audio_map = self._generate_audio_filters(filters, audio_urls)
-            
-            # Image overlays
-            if unique_image_urls:
-                current_video = self._generate_image_overlays(
-                    filters, image_data, unique_image_urls, audio_info, len(audio_urls)
-                )
-            
-            # Subtitle overlay
-            if subtitle_file_path:
-                current_video = self._add_subtitle_filter(filters, current_video, subtitle_file_path)
-            
-            # Complete command
-            if filters:
-                cmd_parts.extend(['-filter_complex', ';'.join(filters)])
-                if current_video != '0:v':
-                    cmd_parts.extend(['-map', f'[{current_video}]'])
-                else:
-                    cmd_parts.extend(['-map', '0:v'])
+                if img['url'] not in image_inputs:
+                    # URLs from _collect_image_data are already processed
+                    image_inputs[img['url']] = img_input_base + len(image_inputs)
+            
+            # Images are downloaded in parallel up front rather than fetched
+            # one after another by FFmpeg while it opens its inputs
+            local_images = self._prefetch_images(list(image_inputs), work_dir) if work_dir else {}
+            for img_url in image_inputs:
+                cmd_parts.extend(self._input_probe_args)
+                cmd_parts.extend(['-i', local_images.get(img_url, img_url)])
+                logger.debug("✓ Image URL added: %s", img_url)
+            
+            if len(audio_urls) == 1 and not image_inputs and not subtitle_file_path:
+                # Single voice track over the plain background: a simple audio
+                # filter is enough, so no filter graph has to be built
+                cmd_parts.extend(['-map', '0:v', '-map', '1:a', '-af', 'apad=pad_dur=2'])
             else:
-                cmd_parts.extend(['-map', '0:v'])
-            
-            cmd_parts.extend(['-map', audio_map])
+                cmd_parts.extend(self._filter_graph_mapping_args(
+                    image_data, image_inputs, audio_info, audio_urls, subtitle_file_path, work_dir
+                ))
             
             # Video encoding settings
-            cmd_parts.extend([
-                '-c:v', 'libx264',
-                '-preset', settings.video_preset,
-                '-crf', str(settings.video_quality_crf)
-            ])
+            cmd_parts.extend(self._video_encoding_args)
             
             # Resolution
             cmd_parts.extend(['-s', f"{config.width}x{config.height}"])
             
-            # Duration
-            cmd_parts.extend(['-t', str(total_duration)])
+            # Duration is bounded by the trimmed background and padded audio
+            cmd_parts.append('-shortest')
             cmd_parts.append(output_path)
             
             logger.info(f"FFmpeg command generated successfully ({len(cmd_parts)} arguments)")
             return cmd_parts
-            
+        
         except Exception as e:
             logger.error(f"Failed to generate FFmpeg command: {e}")
             raise FFmpegError(f"Command generation failed: {e}")
     
-    def execute_ffmpeg_command(self, command: List[str]) -> subprocess.CompletedProcess:
+    def _prefetch_images(self, image_urls: List[str], work_dir: str) -> Dict[str, str]:
+        """
+        Download images to the working directory in parallel
+        
+        Args:
+            image_urls: Distinct image URLs
+            work_dir: Job working directory
+            
+        Returns:
+            Local file path of each downloaded URL; URLs that failed to
+            download are left out so FFmpeg reads them remotely
+        """
+        local_paths: Dict[str, str] = {}
+        if not image_urls:
+            return local_paths
+        
+        deadline = time.monotonic() + settings.image_prefetch_timeout
+        executor = ThreadPoolExecutor(
+            max_workers=min(len(image_urls), _IMAGE_PREFETCH_WORKERS),
+            thread_name_prefix="image-prefetch"
+        )
+        try:
+            future_to_url = {
+                executor.submit(
+                    download_file, url, work_dir, "image",
+                    settings.image_prefetch_max_bytes, deadline
+                ): url
+                for url in image_urls
+            }
+            try:
+                for future in as_completed(future_to_url, timeout=deadline - time.monotonic()):
+                    url = future_to_url[future]
+                    try:
+                        local_paths[url] = future.result()
+                    except FileOperationError as e:
+                        logger.warning("Image prefetch failed, FFmpeg will read %s directly: %s", url, e)
+            except FuturesTimeoutError:
+                logger.warning(
+                    "Image prefetch deadline passed, FFmpeg will read %d image(s) directly",
+                    sum(not future.done() for future in future_to_url)
+                )
+        finally:
+            # Downloads still running past the deadline abort and remove
+            # their partial files on their own
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        return local_paths
+    
+    def _filter_graph_mapping_args(
+        self,
+        image_data: List[Dict[str, Any]],
+        image_inputs: Dict[str, int],
+        audio_info: List[AudioAnalysisResult],
+        audio_urls: List[str],
+        subtitle_file_path: Optional[str],
+        work_dir: Optional[str]
+    ) -> List[str]:
+        """
+        Build the filter graph and the stream mapping that uses it
+        
+        Args:
+            image_data: Image data from scenes
+            image_inputs: Input index of each distinct image URL
+            audio_info: Audio analysis results
+            audio_urls: Audio input URLs
+            subtitle_file_path: Optional ASS subtitle file path
+            work_dir: Directory for the filter script, or None to pass inline
+        
+        Returns:
+            Filter graph and -map arguments
+        """
+        filters = []
+        current_video = '0:v'
+        
+        # Audio processing
+        audio_map = self._generate_audio_filters(filters, audio_urls)
+        
+        # Image overlays
+        if image_inputs:
+            current_video = self._generate_image_overlays(
+                filters, image_data, image_inputs, audio_info
+            )
+        
+        # Subtitle overlay
+        if subtitle_file_path:
+            current_video = self._add_subtitle_filter(filters, current_video, subtitle_file_path)
+        
+        args = []
+        if filters:
+            args.extend(self._filter_graph_args(filters, work_dir))
+            if current_video != '0:v':
+                args.extend(['-map', f'[{current_video}]'])
+            else:
+                args.extend(['-map', '0:v'])
+        else:
+            args.extend(['-map', '0:v'])
+        
+        args.extend(['-map', audio_map])
+        return args
+    
+    def _filter_graph_args(self, filters: List[str], work_dir: Optional[str]) -> List[str]:
+        """
+        Get the arguments that pass the filter graph to FFmpeg
+        
+        The graph grows with every scene and overlay; reading it from a file
+        keeps the argument list small regardless of configuration size.
+        
+        Args:
+            filters: Filter chains
+            work_dir: Directory for the script file, or None to pass inline
+        
+        Returns:
+            List of filter graph arguments
+        """
+        if work_dir is None:
+            return ['-filter_complex', ';'.join(filters)]
+        
+        script_path = os.path.join(work_dir, 'filter_complex.txt')
+        with open(script_path, 'w', encoding='utf-8') as f:
+            f.write(';\n'.join(filters))
+        
+        return ['-filter_complex_script', script_path]
+    
+    def execute_ffmpeg_command(
+        self,
+        command: List[str],
+        progress_callback: Optional[Callable[[float], None]] = None
+    ) -> subprocess.CompletedProcess:
         """
         Execute FFmpeg command with proper error handling
         
+        stderr is read line by line while FFmpeg runs, so memory stays bounded
+        on long encodes and progress can be reported as it happens.
+        
         Args:
             command: FFmpeg command as list of arguments
-            
+            progress_callback: Optional callable receiving the seconds of
+                output encoded so far
+        
         Returns:
-            Completed process result
-            
+            Completed process result (stderr holds the trailing log lines)
+        
         Raises:
             FFmpegError: If command execution fails
         """
         try:
-            # Build properly escaped command string
-            cmd_str = self._build_command_string(command)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Command: %s...", shlex.join(command)[:200])
             
-            logger.info(f"Executing FFmpeg command...")
-            logger.debug(f"Command: {cmd_str[:200]}...")
+            # Wait for an encode slot, then execute command; the argument
+            # list goes straight to exec, with no shell in between
+            with self._transcode_slots:
+                logger.info(f"Executing FFmpeg command...")
+                returncode, stderr_tail, timed_out = self._run_ffmpeg(command, progress_callback)
             
-            # Execute command
-            result = subprocess.run(
-                cmd_str, 
-                shell=True, 
-                capture_output=True, 
-                text=True, 
-                timeout=settings.ffmpeg_timeout
-            )
+            if timed_out:
+                logger.error(f"FFmpeg command timed out after {settings.ffmpeg_timeout} seconds")
+                raise FFmpegError("FFmpeg execution timed out", stderr=stderr_tail)
             
-            if result.returncode != 0:
-                logger.error(f"FFmpeg execution failed: {result.stderr}")
+            if returncode != 0:
+                logger.error(f"FFmpeg execution failed: {stderr_tail}")
                 raise FFmpegError(
-                    f"FFmpeg execution failed with code {result.returncode}",
-                    command=cmd_str,
-                    stderr=result.stderr
+                    f"FFmpeg execution failed with code {returncode}",
+                    command=shlex.join(command),
+                    stderr=stderr_tail
                 )
             
             logger.info("FFmpeg command executed successfully")
-            return result
-            
-        except subprocess.TimeoutExpired:
-            logger.error(f"FFmpeg command timed out after {settings.ffmpeg_timeout} seconds")
-            raise FFmpegError("FFmpeg execution timed out")
+            return subprocess.CompletedProcess(command, returncode, stderr=stderr_tail)
+        
+        except FFmpegError:
+            raise
         except Exception as e:
             logger.error(f"Unexpected error executing FFmpeg: {e}")
             raise FFmpegError(f"FFmpeg execution error: {e}")
     
-    def _validate_config(self, config: VideoConfig, audio_info: List[AudioAnalysisResult]) -> None:
+    def _run_ffmpeg(
+        self,
+        command: List[str],
+        progress_callback: Optional[Callable[[float], None]]
+    ) -> Tuple[int, str, bool]:
+        """
+        Run FFmpeg, following its stderr until it exits
+        
+        Args:
+            command: FFmpeg command as list of arguments
+            progress_callback: Optional callable receiving encoded seconds
+        
+        Returns:
+            Tuple of (return code, trailing stderr log lines, timed out)
+        """
+        stderr_tail = deque(maxlen=_STDERR_TAIL_LINES)
+        timed_out = threading.Event()
+        
+        process = subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors='replace'
+        )
+        
+        def kill_on_timeout():
+            timed_out.set()
+            process.kill()
+        
+        # A timer rather than a check per line: a stalled FFmpeg prints nothing
+        watchdog = threading.Timer(settings.ffmpeg_timeout, kill_on_timeout)
+        watchdog.daemon = True
+        watchdog.start()
+        
+        try:
+            with process.stderr:
+                for line in process.stderr:
+                    if not _PROGRESS_LINE_RE.match(line):
+                        stderr_tail.append(line)
+                    elif progress_callback and line.startswith('out_time_us='):
+                        out_time_us = line[len('out_time_us='):].strip()
+                        if out_time_us.isdigit():
+                            try:
+                                progress_callback(int(out_time_us) / 1_000_000)
+                            except Exception as e:
+                                # Progress reporting must never stop the encode
+                                logger.warning(f"Progress callback failed: {e}")
+            returncode = process.wait()
+        except BaseException:
+            process.kill()
+            process.wait()
+            raise
+        finally:
+            watchdog.cancel()
+        
+        return returncode, ''.join(stderr_tail), timed_out.is_set()
+    
+    def _validate_config(
+        self,
+        config: VideoConfig,
+        audio_info: List[AudioAnalysisResult],
+        subtitle_file_path: Optional[str] = None
+    ) -> None:
         """
         Validate configuration before command generation
         
         Args:
             config: Video configuration
             audio_info: Audio analysis results
-            
+            subtitle_file_path: Optional ASS subtitle file path
+        
         Raises:
             ConfigurationError: If configuration is invalid
         """
@@ -204,6 +581,12 @@ class FFmpegService:
         
         if len(config.scenes) == 0:
             raise ConfigurationError("No scenes specified")
+        
+        # Input URLs are passed as separate arguments; the subtitle path is the
+        # only value formatted into the filter graph, so it is checked once here
+        # instead of being escaped
+        if subtitle_file_path and not _FILTER_SAFE_PATH_RE.match(subtitle_file_path):
+            raise ConfigurationError(f"Unsupported characters in subtitle file path: {subtitle_file_path}")
     
     def _calculate_loops(self, bg_duration: Optional[float], total_duration: float) -> int:
         """
@@ -212,7 +595,7 @@ class FFmpegService:
         Args:
             bg_duration: Background video duration
             total_duration: Total required duration
-            
+        
         Returns:
             Number of loops needed
         """
@@ -220,7 +603,7 @@ class FFmpegService:
             return -1  # Infinite loop as fallback
         
         loops_needed = int(total_duration / bg_duration) + 1
-        logger.debug(f"Background video: {bg_duration}s, Total: {total_duration}s, Loops: {loops_needed}")
+        logger.debug("Background video: %ss, Total: %ss, Loops: %s", bg_duration, total_duration, loops_needed)
         return loops_needed
     
     def _collect_image_data(self, config: VideoConfig) -> List[Dict[str, Any]]:
@@ -229,7 +612,7 @@ class FFmpegService:
         
         Args:
             config: Video configuration
-            
+        
         Returns:
             List of image data dictionaries
         """
@@ -253,14 +636,14 @@ class FFmpegService:
         Args:
             filters: List to append filters to
             audio_urls: List of audio URLs
-            
+        
         Returns:
             Audio map string for final output
         """
         if len(audio_urls) > 1:
+            # One chain: the 2s silence tail is padded straight onto the concat
             audio_inputs = ''.join([f'[{i+1}:a]' for i in range(len(audio_urls))])
-            filters.append(f'{audio_inputs}concat=n={len(audio_urls)}:v=0:a=1[concatenated_audio]')
-            filters.append(f'[concatenated_audio]apad=pad_dur=2[final_audio]')
+            filters.append(f'{audio_inputs}concat=n={len(audio_urls)}:v=0:a=1,apad=pad_dur=2[final_audio]')
             return '[final_audio]'
         elif len(audio_urls) == 1:
             filters.append(f'[1:a]apad=pad_dur=2[final_audio]')
@@ -272,9 +655,8 @@ class FFmpegService:
         self, 
         filters: List[str], 
         image_data: List[Dict[str, Any]], 
-        unique_image_urls: List[str], 
-        audio_info: List[AudioAnalysisResult], 
-        audio_input_count: int
+        image_inputs: Dict[str, int], 
+        audio_info: List[AudioAnalysisResult]
     ) -> str:
         """
         Generate image overlay filters with timing
@@ -282,93 +664,100 @@ class FFmpegService:
         Args:
             filters: List to append filters to
             image_data: Image data from scenes
-            unique_image_urls: List of unique image URLs
+            image_inputs: Input index of each distinct image URL
             audio_info: Audio analysis results
-            audio_input_count: Number of audio inputs
-            
+        
         Returns:
             Final video stream name
         """
-        # Calculate scene timings
         scene_timings = self._calculate_scene_timings(audio_info)
         
+        # Only images whose scene has audio (and so a time window) are shown
+        placed = [
+            (i, img_data, scene_timings[img_data['scene_index']])
+            for i, img_data in enumerate(image_data)
+            if img_data['scene_index'] in scene_timings
+        ]
+        
+        # Each distinct image is scaled once; reuses get copies via split
+        uses_by_url: Dict[str, List[str]] = {}
+        for i, img_data, _ in placed:
+            uses_by_url.setdefault(img_data['url'], []).append(f'scaled_img_{i}')
+        
         current_video = '0:v'
         overlay_count = 0
-        img_input_base = audio_input_count + 1  # First image input index
-        
-        for i, img_data in enumerate(image_data):
-            if img_data['url'] in unique_image_urls:
-                # Find the input index for this image URL
-                img_input_idx = img_input_base + unique_image_urls.index(img_data['url'])
-                scene_idx = img_data['scene_index']
-                
-                # Find timing for this scene
-                scene_timing = next(
-                    (t for t in scene_timings if t['scene_index'] == scene_idx), 
-                    None
+        
+        for i, img_data, scene_timing in placed:
+            scene_idx = img_data['scene_index']
+            start_time, end_time = scene_timing
+            x_pos = img_data['x']
+            y_pos = img_data['y']
+            
+            # Scale image (on the first use of its URL)
+            labels = uses_by_url.pop(img_data['url'], None)
+            if labels:
+                img_input_idx = image_inputs[img_data['url']]
+                if len(labels) == 1:
+                    filters.append(f'[{img_input_idx}:v]scale=500:500[{labels[0]}]')
+                else:
+                    outputs = ''.join(f'[{label}]' for label in labels)
+                    filters.append(f'[{img_input_idx}:v]scale=500:500,split={len(labels)}{outputs}')
+            
+            # Overlay with timing
+            if overlay_count == 0:
+                # First overlay
+                filters.append(
+                    f'[{current_video}][scaled_img_{i}]overlay={x_pos}:{y_pos}:'
+                    f'enable=between(t\\,{start_time}\\,{end_time})[overlay_{overlay_count}]'
+                )
+            else:
+                # Subsequent overlays
+                filters.append(
+                    f'[overlay_{overlay_count-1}][scaled_img_{i}]overlay={x_pos}:{y_pos}:'
+                    f'enable=between(t\\,{start_time}\\,{end_time})[overlay_{overlay_count}]'
                 )
-                
-                if scene_timing:
-                    start_time = scene_timing['start_time']
-                    end_time = scene_timing['end_time']
-                    x_pos = img_data['x']
-                    y_pos = img_data['y']
-                    
-                    # Scale image
-                    filters.append(f'[{img_input_idx}:v]scale=500:500[scaled_img_{i}]')
-                    
-                    # Overlay with timing
-                    if overlay_count == 0:
-                        # First overlay
-                        filters.append(
-                            f'[{current_video}][scaled_img_{i}]overlay={x_pos}:{y_pos}:'
-                            f'enable=between(t\\,{start_time}\\,{end_time})[overlay_{overlay_count}]'
-                        )
-                    else:
-                        # Subsequent overlays
-                        filters.append(
-                            f'[overlay_{overlay_count-1}][scaled_img_{i}]overlay={x_pos}:{y_pos}:'
-                            f'enable=between(t\\,{start_time}\\,{end_time})[overlay_{overlay_count}]'
-                        )
-                    
-                    logger.debug(f"Image {i} overlay: scene {scene_idx}, time {start_time:.1f}-{end_time:.1f}s, pos ({x_pos},{y_pos})")
-                    overlay_count += 1
+            
+            logger.debug(
+                "Image %s overlay: scene %s, time %.1f-%.1fs, pos (%s,%s)",
+                i, scene_idx, start_time, end_time, x_pos, y_pos
+            )
+            overlay_count += 1
         
         return f'overlay_{overlay_count-1}' if overlay_count > 0 else current_video
     
-    def _calculate_scene_timings(self, audio_info: List[AudioAnalysisResult]) -> List[Dict[str, Any]]:
+    def _calculate_scene_timings(self, audio_info: List[AudioAnalysisResult]) -> Dict[int, Tuple[float, float]]:
         """
         Calculate scene timing information
         
         Args:
             audio_info: Audio analysis results
-            
+        
         Returns:
-            List of scene timing dictionaries
+            (start_time, end_time) of each scene with audio, keyed by scene index
         """
-        # Group audio durations by scene
-        scene_audio_durations = {}
+        if not audio_info:
+            return {}
+        
+        # Sum audio durations per scene; scene indices are small and dense,
+        # so a list indexed by scene replaces a dict plus a sort of its keys.
+        # None marks scenes without audio.
+        scene_count = max(info.scene_index for info in audio_info) + 1
+        scene_audio_durations: List[Optional[float]] = [None] * scene_count
         for info in audio_info:
             scene_idx = info.scene_index
-            if scene_idx not in scene_audio_durations:
-                scene_audio_durations[scene_idx] = 0
-            scene_audio_durations[scene_idx] += info.duration
-        
-        # Calculate start/end times for each scene
-        scene_timings = []
-        current_time = 0
-        
-        for scene_idx in sorted(scene_audio_durations.keys()):
-            duration = scene_audio_durations[scene_idx]
-            scene_timings.append({
-                'scene_index': scene_idx,
-                'start_time': current_time,
-                'end_time': current_time + duration,
-                'duration': duration
-            })
-            current_time += duration
-        
-        return scene_timings
+            scene_audio_durations[scene_idx] = (scene_audio_durations[scene_idx] or 0) + info.duration
+        
+        # Scenes play back to back, so their boundaries are the running totals
+        boundaries = list(accumulate(
+            (duration or 0 for duration in scene_audio_durations),
+            initial=0
+        ))
+        
+        return {
+            scene_idx: (boundaries[scene_idx], boundaries[scene_idx + 1])
+            for scene_idx, duration in enumerate(scene_audio_durations)
+            if duration is not None
+        }
     
     def _add_subtitle_filter(self, filters: List[str], current_video: str, subtitle_file_path: str) -> str:
         """
@@ -378,40 +767,20 @@ class FFmpegService:
             filters: List to append filters to
             current_video: Current video stream name
             subtitle_file_path: Path to ASS subtitle file
-            
+        
         Returns:
             Updated video stream name
         """
-        if current_video == '0:v':
-            filters.append(f'[0:v]ass={subtitle_file_path}[subtitled_video]')
+        output_label = f'[{current_video}]'
+        if current_video != '0:v' and filters and filters[-1].endswith(output_label):
+            # Chain onto the filter producing the stream instead of a new chain
+            filters[-1] = f'{filters[-1][:-len(output_label)]},ass={subtitle_file_path}[subtitled_video]'
         else:
-            filters.append(f'[{current_video}]ass={subtitle_file_path}[subtitled_video]')
+            filters.append(f'{output_label}ass={subtitle_file_path}[subtitled_video]')
         
         logger.info(f"✓ Subtitles added using ASS file: {subtitle_file_path}")
         return 'subtitled_video'
     
-    def _build_command_string(self, command: List[str]) -> str:
-        """
-        Build properly escaped command string for shell execution
-        
-        Args:
-            command: Command as list of arguments
-            
-        Returns:
-            Properly escaped command string
-        """
-        cmd_str = command[0]  # 'ffmpeg'
-        for i in range(1, len(command)):
-            part = command[i]
-            # Don't quote flags that start with -
-            if part.startswith('-'):
-                cmd_str += f' {part}'
-            else:
-                # Properly escape other arguments
-                cmd_str += f' {shlex.quote(part)}'
-        
-        return cmd_str
-    
     def validate_ffmpeg_availability(self) -> bool:
         """
         Check if FFmpeg is available on the system
@@ -419,23 +788,21 @@ class FFmpegService:
         Returns:
             True if FFmpeg is available
         """
-        try:
-            result = subprocess.run(
-                ['ffmpeg', '-version'], 
-                capture_output=True, 
-                timeout=30
-            )
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            return False
+        return self.get_ffmpeg_version() is not None
     
     def get_ffmpeg_version(self) -> Optional[str]:
         """
         Get FFmpeg version information
         
+        The binary doesn't change while the process runs, so the first
+        successful ``ffmpeg -version`` is remembered; failures are retried.
+        
         Returns:
             FFmpeg version string or None if not available
         """
+        if self._ffmpeg_version is not None:
+            return self._ffmpeg_version
+        
         try:
             result = subprocess.run(
                 ['ffmpeg', '-version'], 
@@ -445,8 +812,8 @@ class FFmpegService:
             )
             if result.returncode == 0:
                 # Extract version from first line
-                first_line = result.stdout.split('\n')[0]
-                return first_line
+                self._ffmpeg_version = result.stdout.split('\n')[0]
+                return self._ffmpeg_version
             return None
         except (subprocess.TimeoutExpired, FileNotFoundError):
-            return None
\ No newline at end of file
+            return None
@@ -2,21 +2,24 @@
 File-based job management service for async video generation
 Simple, reliable solution that works across multiple workers
 """
-import json
 import os
 import uuid
 import fcntl
+import heapq
 import threading
 import time
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import BinaryIO, Dict, Any, Optional, List, Tuple
 from enum import Enum
 from concurrent.futures import ThreadPoolExecutor
 
+import orjson
+
 from ..config.logging_config import get_logger
 from ..config.settings import settings
 from ..models.video_config import VideoConfig
+from ..exceptions.custom_exceptions import ServiceUnavailableError
 
 logger = get_logger(__name__)
 
@@ -30,6 +33,13 @@ class JobStatus(Enum):
     CANCELLED = "cancelled"
 
 
+# How long finished jobs are kept before they are removed
+JOB_RETENTION = timedelta(hours=1)
+
+# Statuses whose journal record is fsynced before the update returns
+_DURABLE_STATUSES = frozenset({JobStatus.COMPLETED.value, JobStatus.FAILED.value})
+
+
 class FileJobService:
     """File-based job management service"""
     
@@ -37,11 +47,26 @@ class FileJobService:
         self.jobs_dir = Path(settings.output_dir) / "jobs"
         self.jobs_dir.mkdir(exist_ok=True)
         
+        # Parsed job files for listings, keyed by file name and validated
+        # against the job file's (mtime_ns, size) and the journal's size so
+        # only changed jobs are re-read
+        self._parse_cache: Dict[str, Tuple[int, int, int, Dict[str, Any]]] = {}
+        self._parse_cache_lock = threading.Lock()
+        
+        # Min-heap of (expiry timestamp, job_id) for finished jobs
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._expiry_cv = threading.Condition()
+        
         self.executor = ThreadPoolExecutor(
             max_workers=getattr(settings, 'video_generation_workers', 2),
             thread_name_prefix="video-gen"
         )
         
+        # Bounds running plus queued jobs so bursts of submissions get rejected
+        # instead of piling up in the executor's unbounded queue
+        self.max_queued_jobs = settings.max_queued_jobs or 2 * self.executor._max_workers
+        self._job_slots = threading.BoundedSemaphore(self.executor._max_workers + self.max_queued_jobs)
+        
         # Start cleanup thread
         self._start_cleanup_thread()
         
@@ -52,56 +77,156 @@ class FileJobService:
         """Get the file path for a job"""
         return self.jobs_dir / f"{job_id}.json"
     
-    def _read_job_file(self, job_id: str) -> Optional[Dict[str, Any]]:
-        """Safely read a job file with file locking"""
-        job_file = self._get_job_file(job_id)
+    def _get_journal_file(self, job_id: str) -> Path:
+        """Get the path of a job's update journal"""
+        return self.jobs_dir / f"{job_id}.log"
+    
+    def _apply_journal(self, log: BinaryIO, job_data: Dict[str, Any]) -> None:
+        """Fold the records of an open journal into a job's data"""
+        for line in log:
+            try:
+                job_data.update(orjson.loads(line))
+            except orjson.JSONDecodeError:
+                break  # Partially written last record
+    
+    def _replace_job_file(self, job_file: Path, job_data: Dict[str, Any], sync: bool = False) -> None:
+        """Write a job file through a temporary file so readers never see a partial write"""
+        tmp_file = job_file.with_name(f"{job_file.name}.tmp.{os.getpid()}.{threading.get_ident()}")
         
-        if not job_file.exists():
-            return None
+        try:
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps(job_data))
+                if sync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_file, job_file)
+        except BaseException:
+            tmp_file.unlink(missing_ok=True)
+            raise
+    
+    def _read_job_file(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Read a job file and apply its journal"""
+        # Open the journal before the job file: if compaction replaces the job
+        # file in between, the open journal still holds the records it folded in
+        try:
+            log = open(self._get_journal_file(job_id), 'rb')
+        except FileNotFoundError:
+            log = None
         
         try:
-            with open(job_file, 'r') as f:
-                fcntl.flock(f.fileno(), fcntl.LOCK_SH)  # Shared lock for reading
-                return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
+            with open(self._get_job_file(job_id), 'rb') as f:
+                job_data = orjson.loads(f.read())
+            if log is not None:
+                self._apply_journal(log, job_data)
+            return job_data
+        except FileNotFoundError:
+            return None
+        except (orjson.JSONDecodeError, IOError) as e:
             logger.warning(f"Failed to read job file {job_id}: {e}")
             return None
+        finally:
+            if log is not None:
+                log.close()
     
     def _write_job_file(self, job_id: str, job_data: Dict[str, Any]) -> bool:
-        """Safely write a job file with file locking"""
-        job_file = self._get_job_file(job_id)
-        
+        """Atomically write a job file"""
         try:
-            with open(job_file, 'w') as f:
-                fcntl.flock(f.fileno(), fcntl.LOCK_EX)  # Exclusive lock for writing
-                json.dump(job_data, f, indent=2)
+            self._replace_job_file(self._get_job_file(job_id), job_data)
             return True
-        except (IOError, OSError) as e:
+        except (IOError, OSError, TypeError) as e:
             logger.error(f"Failed to write job file {job_id}: {e}")
             return False
     
     def _update_job_file(self, job_id: str, updates: Dict[str, Any]) -> bool:
-        """Safely update a job file with file locking"""
-        job_file = self._get_job_file(job_id)
-        
-        if not job_file.exists():
+        """Append an update to a job's journal"""
+        if not self._get_job_file(job_id).exists():
             return False
         
+        delta = dict(updates)
+        delta['updated_at'] = datetime.utcnow().isoformat()
+        
         try:
-            with open(job_file, 'r+') as f:
-                fcntl.flock(f.fileno(), fcntl.LOCK_EX)  # Exclusive lock
-                job_data = json.load(f)
-                job_data.update(updates)
-                job_data['updated_at'] = datetime.utcnow().isoformat()
-                
-                f.seek(0)
-                json.dump(job_data, f, indent=2)
-                f.truncate()
-            return True
-        except (json.JSONDecodeError, IOError, OSError) as e:
+            record = orjson.dumps(delta) + b'\n'
+            while True:
+                with open(self._get_journal_file(job_id), 'ab') as log:
+                    # The journal lock only serializes appends with compaction
+                    fcntl.flock(log.fileno(), fcntl.LOCK_EX)
+                    if os.fstat(log.fileno()).st_nlink == 0:
+                        continue  # Compacted and removed while waiting; reopen
+                    
+                    log.write(record)
+                    if delta.get('status') in _DURABLE_STATUSES:
+                        log.flush()
+                        os.fsync(log.fileno())
+                return True
+        except (IOError, OSError, TypeError) as e:
             logger.error(f"Failed to update job file {job_id}: {e}")
             return False
     
+    def _compact_job_file(self, job_id: str) -> None:
+        """Fold a job's journal into its job file and remove the journal"""
+        journal_file = self._get_journal_file(job_id)
+        job_file = self._get_job_file(job_id)
+        
+        try:
+            with open(journal_file, 'rb') as log:
+                fcntl.flock(log.fileno(), fcntl.LOCK_EX)
+                if os.fstat(log.fileno()).st_nlink == 0:
+                    return  # Already compacted by another worker
+                
+                with open(job_file, 'rb') as f:
+                    job_data = orjson.loads(f.read())
+                self._apply_journal(log, job_data)
+                
+                self._replace_job_file(job_file, job_data, sync=True)
+                journal_file.unlink()
+        except FileNotFoundError:
+            return
+        except (orjson.JSONDecodeError, IOError, OSError) as e:
+            logger.warning(f"Failed to compact job file {job_id}: {e}")
+    
+    def _scan_job_files(self) -> List[os.DirEntry]:
+        """List job files with a single directory scan, forgetting deleted ones"""
+        with os.scandir(self.jobs_dir) as it:
+            entries = [entry for entry in it if entry.name.endswith('.json') and entry.is_file()]
+        
+        names = {entry.name for entry in entries}
+        with self._parse_cache_lock:
+            for name in [name for name in self._parse_cache if name not in names]:
+                del self._parse_cache[name]
+        
+        return entries
+    
+    def _read_job_entry(self, entry: os.DirEntry) -> Optional[Dict[str, Any]]:
+        """
+        Read a scanned job file, reusing the parsed data if it hasn't changed
+        
+        The returned dictionary is shared with the cache and must not be modified.
+        """
+        job_id = entry.name[:-len('.json')]
+        
+        try:
+            st = entry.stat()
+        except OSError:
+            return None
+        
+        try:
+            journal_size = os.stat(self._get_journal_file(job_id)).st_size
+        except FileNotFoundError:
+            journal_size = 0
+        
+        key = (st.st_mtime_ns, st.st_size, journal_size)
+        with self._parse_cache_lock:
+            cached = self._parse_cache.get(entry.name)
+        if cached is not None and cached[:3] == key:
+            return cached[3]
+        
+        job_data = self._read_job_file(job_id)
+        if job_data is not None:
+            with self._parse_cache_lock:
+                self._parse_cache[entry.name] = (*key, job_data)
+        return job_data
+    
     def create_job(self, config: VideoConfig) -> str:
         """Create a new video generation job"""
         job_id = str(uuid.uuid4())
@@ -141,7 +266,19 @@ class FileJobService:
         return None
     
     def submit_job(self, job_id: str, generation_func, *args, **kwargs):
-        """Submit a job for background execution"""
+        """
+        Submit a job for background execution
+        
+        Raises:
+            ServiceUnavailableError: If the job queue is full; the job is marked as failed
+        """
+        if not self._job_slots.acquire(blocking=False):
+            self.fail_job(job_id, "Job queue is full")
+            raise ServiceUnavailableError(
+                "Job queue is full, try again later",
+                {"max_queued_jobs": self.max_queued_jobs}
+            )
+        
         def run_job():
             try:
                 self.update_job_status(job_id, JobStatus.PROCESSING, "Starting video generation")
@@ -150,8 +287,15 @@ class FileJobService:
             except Exception as e:
                 logger.error(f"Job {job_id} failed: {e}")
                 self.fail_job(job_id, str(e))
+            finally:
+                self._job_slots.release()
+        
+        try:
+            future = self.executor.submit(run_job)
+        except RuntimeError:
+            self._job_slots.release()
+            raise
         
-        future = self.executor.submit(run_job)
         logger.info(f"Job {job_id} submitted for processing")
         return future
     
@@ -204,6 +348,7 @@ class FileJobService:
         }
         
         self._update_job_file(job_id, updates)
+        self._job_finished(job_id)
         logger.info(f"Job {job_id} completed successfully in {duration_seconds:.1f}s" if duration_seconds else f"Job {job_id} completed successfully")
     
     def fail_job(self, job_id: str, error: str):
@@ -216,6 +361,7 @@ class FileJobService:
         }
         
         self._update_job_file(job_id, updates)
+        self._job_finished(job_id)
         logger.error(f"Job {job_id} failed: {error}")
     
     def cancel_job(self, job_id: str) -> bool:
@@ -230,6 +376,7 @@ class FileJobService:
             }
             
             if self._update_job_file(job_id, updates):
+                self._job_finished(job_id)
                 logger.info(f"Job {job_id} cancelled")
                 return True
         
@@ -240,14 +387,13 @@ class FileJobService:
         jobs = []
         
         # Get all job files
-        job_files = list(self.jobs_dir.glob("*.json"))
+        job_files = self._scan_job_files()
         
         # Sort by modification time (newest first)
-        job_files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
+        job_files.sort(key=lambda entry: entry.stat().st_mtime_ns, reverse=True)
         
         for job_file in job_files[:limit * 2]:  # Read more in case some are filtered
-            job_id = job_file.stem
-            job_data = self._read_job_file(job_id)
+            job_data = self._read_job_entry(job_file)
             
             if job_data:
                 # Filter by status if specified
@@ -265,14 +411,14 @@ class FileJobService:
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get job statistics"""
-        job_files = list(self.jobs_dir.glob("*.json"))
+        job_files = self._scan_job_files()
         total_jobs = len(job_files)
         
         status_counts = {status.value: 0 for status in JobStatus}
         completed_durations = []
         
         for job_file in job_files:
-            job_data = self._read_job_file(job_file.stem)
+            job_data = self._read_job_entry(job_file)
             if job_data:
                 status = job_data.get('status')
                 if status in status_counts:
@@ -295,13 +441,44 @@ class FileJobService:
             "max_workers": self.executor._max_workers
         }
     
+    def _job_finished(self, job_id: str) -> None:
+        """Fold the journal of a finished job and schedule its removal"""
+        self._compact_job_file(job_id)
+        self._schedule_expiry(job_id)
+    
+    def _schedule_expiry(self, job_id: str, finished_at: Optional[float] = None) -> None:
+        """
+        Schedule removal of a finished job
+        
+        Args:
+            job_id: Job identifier
+            finished_at: Unix timestamp the job finished at (default: now)
+        """
+        if finished_at is None:
+            finished_at = time.time()
+        
+        with self._expiry_cv:
+            heapq.heappush(self._expiry_heap, (finished_at + JOB_RETENTION.total_seconds(), job_id))
+            self._expiry_cv.notify()
+    
     def _start_cleanup_thread(self):
-        """Start background thread to cleanup old job files"""
+        """Start background thread that removes finished jobs once they expire"""
         def cleanup_old_jobs():
+            # Pick up jobs finished before this worker started
+            try:
+                self._cleanup_old_jobs()
+            except Exception as e:
+                logger.error(f"Error in cleanup thread: {e}")
+            
             while True:
+                with self._expiry_cv:
+                    while not self._expiry_heap or self._expiry_heap[0][0] > time.time():
+                        timeout = self._expiry_heap[0][0] - time.time() if self._expiry_heap else None
+                        self._expiry_cv.wait(timeout)
+                    _, job_id = heapq.heappop(self._expiry_heap)
+                
                 try:
-                    time.sleep(300)  # Check every 5 minutes
-                    self._cleanup_old_jobs()
+                    self._remove_job(job_id)
                 except Exception as e:
                     logger.error(f"Error in cleanup thread: {e}")
         
@@ -312,14 +489,25 @@ class FileJobService:
         )
         cleanup_thread.start()
     
+    def _remove_job(self, job_id: str) -> None:
+        """Delete a job's files"""
+        job_file = self._get_job_file(job_id)
+        
+        job_file.unlink(missing_ok=True)
+        self._get_journal_file(job_id).unlink(missing_ok=True)
+        with self._parse_cache_lock:
+            self._parse_cache.pop(job_file.name, None)
+        logger.debug(f"Cleaned up old job file: {job_file.name}")
+    
     def _cleanup_old_jobs(self):
-        """Remove old completed/failed job files"""
-        cutoff_time = datetime.utcnow() - timedelta(hours=1)  # 1 hour
-        job_files = list(self.jobs_dir.glob("*.json"))
+        """Remove expired job files, schedule removal of other finished jobs and compact journals"""
+        cutoff_time = datetime.utcnow() - JOB_RETENTION
+        job_files = self._scan_job_files()
         
         removed_count = 0
         for job_file in job_files:
-            job_data = self._read_job_file(job_file.stem)
+            job_id = job_file.name[:-len('.json')]
+            job_data = self._read_job_entry(job_file)
             
             if job_data and job_data['status'] in [JobStatus.COMPLETED.value, JobStatus.FAILED.value, JobStatus.CANCELLED.value]:
                 completed_at = job_data.get('completed_at')
@@ -327,11 +515,14 @@ class FileJobService:
                     try:
                         completed_dt = datetime.fromisoformat(completed_at)
                         if completed_dt < cutoff_time:
-                            job_file.unlink()
+                            self._remove_job(job_id)
                             removed_count += 1
-                            logger.debug(f"Cleaned up old job file: {job_file.name}")
+                            continue
+                        self._schedule_expiry(job_id, completed_dt.replace(tzinfo=timezone.utc).timestamp())
                     except (ValueError, OSError) as e:
                         logger.warning(f"Failed to cleanup job file {job_file.name}: {e}")
+            
+            self._compact_job_file(job_id)
         
         if removed_count > 0:
             logger.info(f"Cleaned up {removed_count} old job files")
@@ -343,5 +534,13 @@ class FileJobService:
         logger.info("FileJobService shutdown complete")
 
 
+def _create_job_service() -> FileJobService:
+    """Create the job service for the configured job store"""
+    if settings.job_store == 'sqlite':
+        from .sqlite_job_service import SQLiteJobService
+        return SQLiteJobService()
+    return FileJobService()
+
+
 # Global job service instance
-job_service = FileJobService()
\ No newline at end of file
+job_service = _create_job_service()
\ No newline at end of file
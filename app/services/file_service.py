@@ -1,13 +1,18 @@
 """
 File management service for downloads, cleanup, and temporary file handling
 """
+import atexit
 import os
+import shutil
+import stat
+import tempfile
 import time
 import threading
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from ..config.logging_config import get_logger
 from ..config.settings import settings
-from ..utils.file_utils import cleanup_old_files, ensure_directory, get_file_size_mb, is_file_accessible
+from ..utils.cache_utils import ttl_cache
+from ..utils.file_utils import cleanup_old_files, ensure_directory
 from ..exceptions.custom_exceptions import FileOperationError
 
 logger = get_logger(__name__)
@@ -22,9 +27,19 @@ class FileService:
         self._temp_files = []
         self._temp_files_lock = threading.Lock()
         
+        # Per-worker scratch area for job working directories
+        self.scratch_root = os.path.join(self._get_scratch_base(), f"vidgen-{os.getpid()}")
+        os.makedirs(self.scratch_root, exist_ok=True)
+        atexit.register(shutil.rmtree, self.scratch_root, True)
+        
         # Ensure output directory exists
         self.ensure_output_directory()
         
+        # Deletions in the output directory are done relative to this
+        # descriptor so the kernel doesn't resolve the full path each time
+        self._output_dir_fd = os.open(settings.output_dir, os.O_RDONLY | os.O_DIRECTORY | os.O_CLOEXEC)
+        atexit.register(os.close, self._output_dir_fd)
+        
         # Start cleanup thread
         self.start_cleanup_service()
     
@@ -61,21 +76,102 @@ class FileService:
         Args:
             file_paths: Specific files to clean up, or None for all registered files
         """
-        files_to_clean = file_paths or self._temp_files.copy()
+        with self._temp_files_lock:
+            files_to_clean = file_paths or self._temp_files.copy()
+        
+        removed = set(self._unlink_files(files_to_clean))
+        
+        # Remove from tracking
+        with self._temp_files_lock:
+            self._temp_files = [path for path in self._temp_files if path not in removed]
+    
+    def _unlink_files(self, file_paths: List[str]) -> List[str]:
+        """
+        Delete a batch of files, resolving each directory only once
+        
+        Files are grouped by directory and unlinked relative to an open
+        descriptor of that directory (unlinkat), so the kernel does not walk
+        the full path again for every file.
+        
+        Args:
+            file_paths: Files to delete
+            
+        Returns:
+            Paths that no longer exist (deleted or already missing)
+        """
+        names_by_dir: Dict[str, List[str]] = {}
+        for file_path in file_paths:
+            directory, name = os.path.split(file_path)
+            names_by_dir.setdefault(directory, []).append(name)
         
-        for file_path in files_to_clean:
+        removed = []
+        for directory, names in names_by_dir.items():
             try:
-                if os.path.exists(file_path):
-                    os.unlink(file_path)
-                    logger.debug(f"Cleaned up temp file: {file_path}")
-                
-                # Remove from tracking
-                with self._temp_files_lock:
-                    if file_path in self._temp_files:
-                        self._temp_files.remove(file_path)
-                        
-            except Exception as e:
-                logger.warning(f"Failed to cleanup temp file {file_path}: {e}")
+                dir_fd = os.open(directory or '.', os.O_RDONLY | os.O_DIRECTORY | os.O_CLOEXEC)
+            except FileNotFoundError:
+                removed.extend(os.path.join(directory, name) for name in names)
+                continue
+            except OSError as e:
+                logger.warning(f"Failed to open directory {directory} for cleanup: {e}")
+                continue
+            
+            try:
+                for name in names:
+                    file_path = os.path.join(directory, name)
+                    try:
+                        os.unlink(name, dir_fd=dir_fd)
+                        logger.debug(f"Cleaned up temp file: {file_path}")
+                    except FileNotFoundError:
+                        pass
+                    except OSError as e:
+                        logger.warning(f"Failed to cleanup temp file {file_path}: {e}")
+                        continue
+                    removed.append(file_path)
+            finally:
+                os.close(dir_fd)
+        
+        return removed
+    
+    def _get_scratch_base(self) -> str:
+        """
+        Pick the base directory for scratch space
+        
+        Prefers RAM-backed /dev/shm so intermediate files never hit disk.
+        
+        Returns:
+            Base directory path
+        """
+        if settings.scratch_dir:
+            return settings.scratch_dir
+        
+        if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+            return '/dev/shm'
+        
+        return tempfile.gettempdir()
+    
+    def create_scratch_dir(self, name: str) -> str:
+        """
+        Create a working directory inside the worker's scratch area
+        
+        Args:
+            name: Unique directory name (e.g. job ID)
+            
+        Returns:
+            Path to the working directory
+        """
+        path = os.path.join(self.scratch_root, name)
+        os.makedirs(path, exist_ok=True)
+        return path
+    
+    def remove_scratch_dir(self, path: str) -> None:
+        """
+        Remove a working directory and everything in it
+        
+        Args:
+            path: Working directory created by create_scratch_dir
+        """
+        shutil.rmtree(path, ignore_errors=True)
+        logger.debug(f"Cleaned up scratch dir: {path}")
     
     def start_cleanup_service(self) -> None:
         """Start the background cleanup service"""
@@ -120,62 +216,91 @@ class FileService:
         current_time = time.time()
         
         with self._temp_files_lock:
-            orphaned_files = []
-            for file_path in self._temp_files:
-                try:
-                    if os.path.exists(file_path):
-                        file_age = current_time - os.path.getctime(file_path)
-                        if file_age > 3600:  # 1 hour
-                            orphaned_files.append(file_path)
-                    else:
-                        # File doesn't exist, remove from tracking
-                        orphaned_files.append(file_path)
-                except Exception:
-                    # If we can't check the file, consider it orphaned
+            tracked_files = self._temp_files.copy()
+        
+        orphaned_files = []
+        removed = set()
+        for file_path in tracked_files:
+            try:
+                file_age = current_time - os.stat(file_path).st_ctime
+                if file_age > 3600:  # 1 hour
                     orphaned_files.append(file_path)
-            
-            # Clean up orphaned files
-            for file_path in orphaned_files:
-                try:
-                    if os.path.exists(file_path):
-                        os.unlink(file_path)
-                        logger.debug(f"Cleaned up orphaned temp file: {file_path}")
-                    self._temp_files.remove(file_path)
-                except Exception as e:
-                    logger.warning(f"Failed to cleanup orphaned file {file_path}: {e}")
+            except FileNotFoundError:
+                # File is already gone, only stop tracking it
+                removed.add(file_path)
+            except OSError:
+                # If we can't check the file, consider it orphaned
+                orphaned_files.append(file_path)
+        
+        # Clean up orphaned files; missing files count as removed
+        removed.update(self._unlink_files(orphaned_files))
+        
+        if removed:
+            with self._temp_files_lock:
+                self._temp_files = [path for path in self._temp_files if path not in removed]
     
-    def get_video_file_info(self, video_id: str) -> Optional[Dict[str, Any]]:
+    @ttl_cache(ttl=2, maxsize=10000)
+    def get_video_file_info(self, video_id: str) -> Dict[str, Any]:
         """
         Get information about a generated video file
         
+        Results are cached for two seconds so clients polling job status
+        don't stat the same file on every request.
+        
         Args:
             video_id: Video ID
             
         Returns:
-            Dictionary with file information or None if not found
+            Dictionary with file information ({'exists': False} if not found)
         """
         try:
             filename = f"{video_id}.mp4"
             file_path = os.path.join(settings.output_dir, filename)
             
-            if not is_file_accessible(file_path):
-                return None
+            try:
+                stat_result = os.stat(file_path)
+            except (FileNotFoundError, NotADirectoryError):
+                return {'exists': False}
             
-            file_size = get_file_size_mb(file_path)
-            created_time = os.path.getctime(file_path)
+            if not stat.S_ISREG(stat_result.st_mode):
+                return {'exists': False}
             
-            return {
-                'exists': True,
-                'path': file_path,
-                'size_mb': file_size,
-                'created_timestamp': created_time,
-                'created': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(created_time)),
-                'download_url': f'/download/{video_id}'
-            }
+            return self._build_video_info(video_id, file_path, stat_result)
             
         except Exception as e:
             logger.error(f"Error getting video file info for {video_id}: {e}")
-            return None
+            return {'exists': False}
+    
+    def invalidate_video_file_info(self, video_id: str) -> None:
+        """
+        Drop the cached file information for a video
+        
+        Args:
+            video_id: Video ID
+        """
+        FileService.get_video_file_info.cache_invalidate(self, video_id)
+    
+    def _build_video_info(self, video_id: str, file_path: str, stat_result: os.stat_result) -> Dict[str, Any]:
+        """
+        Build the video information dictionary from a stat result
+        
+        Args:
+            video_id: Video ID
+            file_path: Path to the video file
+            stat_result: Stat result for the file
+            
+        Returns:
+            Dictionary with file information
+        """
+        created_time = stat_result.st_ctime
+        return {
+            'exists': True,
+            'path': file_path,
+            'size_mb': round(stat_result.st_size / (1024 * 1024), 2),
+            'created_timestamp': created_time,
+            'created': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(created_time)),
+            'download_url': f'/download/{video_id}'
+        }
     
     def delete_video_file(self, video_id: str) -> bool:
         """
@@ -188,16 +313,16 @@ class FileService:
             True if file was deleted successfully
         """
         try:
-            filename = f"{video_id}.mp4"
-            file_path = os.path.join(settings.output_dir, filename)
-            
-            if os.path.exists(file_path):
-                os.unlink(file_path)
-                logger.info(f"Deleted video file: {video_id}")
-                return True
+            try:
+                os.unlink(f"{video_id}.mp4", dir_fd=self._output_dir_fd)
+            except FileNotFoundError:
+                logger.warning(f"Video file not found for deletion: {video_id}")
+                return False
+            finally:
+                self.invalidate_video_file_info(video_id)
             
-            logger.warning(f"Video file not found for deletion: {video_id}")
-            return False
+            logger.info(f"Deleted video file: {video_id}")
+            return True
             
         except Exception as e:
             logger.error(f"Failed to delete video file {video_id}: {e}")
@@ -214,40 +339,70 @@ class FileService:
             List of video file information dictionaries
         """
         try:
-            video_files = []
-            
-            if not os.path.exists(settings.output_dir):
-                return video_files
-            
-            # Get all mp4 files
-            files = [
-                f for f in os.listdir(settings.output_dir) 
-                if f.endswith('.mp4') and os.path.isfile(os.path.join(settings.output_dir, f))
-            ]
-            
-            # Sort by creation time (newest first)
-            files.sort(
-                key=lambda f: os.path.getctime(os.path.join(settings.output_dir, f)), 
-                reverse=True
-            )
-            
-            # Limit results
-            files = files[:limit]
-            
-            # Get file info for each
-            for filename in files:
-                video_id = filename[:-4]  # Remove .mp4 extension
-                file_info = self.get_video_file_info(video_id)
-                if file_info:
-                    file_info['video_id'] = video_id
-                    video_files.append(file_info)
-            
-            return video_files
+            videos, _, _ = self._scan_output_dir()
+            return self._build_video_list(videos, limit)
             
+        except FileNotFoundError:
+            return []
         except Exception as e:
             logger.error(f"Error listing video files: {e}")
             return []
     
+    def _scan_output_dir(self) -> Tuple[List[Tuple[os.DirEntry, os.stat_result]], int, int]:
+        """
+        Scan the output directory, stating every file exactly once
+        
+        Returns:
+            Tuple of ((entry, stat) of each video, total size in bytes, file count)
+            
+        Raises:
+            FileNotFoundError: If the output directory does not exist
+        """
+        total_size = 0
+        file_count = 0
+        videos = []
+        
+        with os.scandir(settings.output_dir) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                
+                stat_result = entry.stat()
+                total_size += stat_result.st_size
+                file_count += 1
+                
+                if entry.name.endswith('.mp4'):
+                    videos.append((entry, stat_result))
+        
+        return videos, total_size, file_count
+    
+    def _build_video_list(
+        self,
+        videos: List[Tuple[os.DirEntry, os.stat_result]],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Build video information for the newest scanned videos
+        
+        Args:
+            videos: (entry, stat) of each video from _scan_output_dir
+            limit: Maximum number of videos to return
+            
+        Returns:
+            List of video file information dictionaries, newest first
+        """
+        # Sort by creation time (newest first) and limit results
+        videos.sort(key=lambda item: item[1].st_ctime, reverse=True)
+        
+        video_files = []
+        for entry, stat_result in videos[:limit]:
+            video_id = entry.name[:-4]  # Remove .mp4 extension
+            file_info = self._build_video_info(video_id, entry.path, stat_result)
+            file_info['video_id'] = video_id
+            video_files.append(file_info)
+        
+        return video_files
+    
     def get_disk_usage(self) -> Dict[str, Any]:
         """
         Get disk usage statistics for output directory
@@ -256,34 +411,57 @@ class FileService:
             Dictionary with disk usage information
         """
         try:
-            total_size = 0
-            file_count = 0
+            _, total_size, file_count = self._scan_output_dir()
+            return self._build_disk_usage(total_size, file_count)
             
-            if os.path.exists(settings.output_dir):
-                for filename in os.listdir(settings.output_dir):
-                    file_path = os.path.join(settings.output_dir, filename)
-                    if os.path.isfile(file_path):
-                        total_size += os.path.getsize(file_path)
-                        file_count += 1
+        except FileNotFoundError:
+            return self._build_disk_usage(0, 0)
+        except Exception as e:
+            logger.error(f"Error getting disk usage: {e}")
+            disk_usage = self._build_disk_usage(0, 0)
+            disk_usage['error'] = str(e)
+            return disk_usage
+    
+    def _build_disk_usage(self, total_size: int, file_count: int) -> Dict[str, Any]:
+        """
+        Build the disk usage dictionary
+        
+        Args:
+            total_size: Total size in bytes
+            file_count: Number of files
             
-            return {
-                'total_files': file_count,
-                'total_size_bytes': total_size,
-                'total_size_mb': round(total_size / (1024 * 1024), 2),
-                'total_size_gb': round(total_size / (1024 * 1024 * 1024), 2),
-                'output_directory': settings.output_dir
-            }
+        Returns:
+            Dictionary with disk usage information
+        """
+        return {
+            'total_files': file_count,
+            'total_size_bytes': total_size,
+            'total_size_mb': round(total_size / (1024 * 1024), 2),
+            'total_size_gb': round(total_size / (1024 * 1024 * 1024), 2),
+            'output_directory': settings.output_dir
+        }
+    
+    def list_and_measure(self, limit: int = 100) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        List generated videos and compute disk usage in a single directory scan
+        
+        Args:
+            limit: Maximum number of videos to return
             
+        Returns:
+            Tuple of (video file information list, disk usage dictionary)
+        """
+        try:
+            videos, total_size, file_count = self._scan_output_dir()
+            return self._build_video_list(videos, limit), self._build_disk_usage(total_size, file_count)
+            
+        except FileNotFoundError:
+            return [], self._build_disk_usage(0, 0)
         except Exception as e:
-            logger.error(f"Error getting disk usage: {e}")
-            return {
-                'total_files': 0,
-                'total_size_bytes': 0,
-                'total_size_mb': 0,
-                'total_size_gb': 0,
-                'output_directory': settings.output_dir,
-                'error': str(e)
-            }
+            logger.error(f"Error listing video files: {e}")
+            disk_usage = self._build_disk_usage(0, 0)
+            disk_usage['error'] = str(e)
+            return [], disk_usage
     
     def validate_file_permissions(self) -> List[str]:
         """
@@ -0,0 +1,49 @@
+"""
+Process-wide service instances shared across blueprints
+
+Each service module is imported when its instance is first requested.
+"""
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .audio_service import AudioService
+    from .transcription_service import TranscriptionService
+    from .subtitle_service import SubtitleService
+    from .ffmpeg_service import FFmpegService
+    from .file_service import FileService
+
+
+@lru_cache(maxsize=None)
+def get_audio_service() -> "AudioService":
+    """Get the shared AudioService instance"""
+    from .audio_service import AudioService
+    return AudioService()
+
+
+@lru_cache(maxsize=None)
+def get_transcription_service() -> "TranscriptionService":
+    """Get the shared TranscriptionService instance"""
+    from .transcription_service import TranscriptionService
+    return TranscriptionService()
+
+
+@lru_cache(maxsize=None)
+def get_subtitle_service() -> "SubtitleService":
+    """Get the shared SubtitleService instance"""
+    from .subtitle_service import SubtitleService
+    return SubtitleService()
+
+
+@lru_cache(maxsize=None)
+def get_ffmpeg_service() -> "FFmpegService":
+    """Get the shared FFmpegService instance"""
+    from .ffmpeg_service import FFmpegService
+    return FFmpegService()
+
+
+@lru_cache(maxsize=None)
+def get_file_service() -> "FileService":
+    """Get the shared FileService instance"""
+    from .file_service import FileService
+    return FileService()
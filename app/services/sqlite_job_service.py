@@ -0,0 +1,291 @@
+"""
+SQLite-backed job management service
+Shares one WAL-mode database between all workers so job lookups, listings
+and statistics are indexed queries instead of directory scans, and progress
+ticks update two columns instead of rewriting the whole job record
+"""
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+
+import orjson
+
+from ..config.logging_config import get_logger
+from ..config.settings import settings
+from .file_job_service import JOB_RETENTION, FileJobService, JobStatus
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    progress INTEGER,
+    current_step TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    completed_at TEXT,
+    duration_seconds REAL,
+    data TEXT NOT NULL,
+    config TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_updated ON jobs (status, updated_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_updated ON jobs (updated_at);
+"""
+
+# Columns added after the first schema version
+_PROGRESS_COLUMNS = (
+    ('progress', 'INTEGER'),
+    ('current_step', 'TEXT')
+)
+
+_FINISHED_STATUSES = (
+    JobStatus.COMPLETED.value,
+    JobStatus.FAILED.value,
+    JobStatus.CANCELLED.value
+)
+
+
+class SQLiteJobService(FileJobService):
+    """Job management service storing jobs in a SQLite database"""
+    
+    def __init__(self):
+        self._local = threading.local()
+        
+        # The database must exist before the base class starts the cleanup thread
+        self.db_path = Path(settings.output_dir) / "jobs" / "jobs.db"
+        self.db_path.parent.mkdir(exist_ok=True)
+        self._create_schema()
+        
+        super().__init__()
+        
+        logger.info(f"Job database: {self.db_path}")
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's database connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit mode; multi-statement updates use explicit transactions
+            conn = sqlite3.connect(self.db_path, isolation_level=None, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def _create_schema(self) -> None:
+        """Create the jobs table, adding columns missing from older databases"""
+        conn = self._connection()
+        conn.executescript(_SCHEMA)
+        
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+        for column, column_type in _PROGRESS_COLUMNS:
+            if column not in columns:
+                conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+    
+    def _row_values(self, job_data: Dict[str, Any]) -> tuple:
+        """Split a job dictionary into column values"""
+        data = dict(job_data)
+        config = data.pop('config', None)
+        return (
+            data['status'],
+            data.get('progress'),
+            data.get('current_step'),
+            data['created_at'],
+            data['updated_at'],
+            data.get('completed_at'),
+            data.get('duration_seconds'),
+            orjson.dumps(data).decode(),
+            orjson.dumps(config).decode() if config is not None else None,
+            data['job_id']
+        )
+    
+    def _load_row(self, row: tuple) -> Dict[str, Any]:
+        """Build a job dictionary from (data, progress, current_step, updated_at) columns"""
+        job_data = orjson.loads(row[0])
+        
+        # The progress columns are written on every tick and may be newer than the data blob
+        if row[1] is not None:
+            job_data['progress'] = row[1]
+        if row[2] is not None:
+            job_data['current_step'] = row[2]
+        job_data['updated_at'] = row[3]
+        return job_data
+    
+    def _read_job_file(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Read a job record"""
+        try:
+            row = self._connection().execute(
+                "SELECT data, progress, current_step, updated_at, config FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to read job {job_id}: {e}")
+            return None
+        
+        if row is None:
+            return None
+        
+        job_data = self._load_row(row)
+        job_data['config'] = orjson.loads(row[4]) if row[4] is not None else None
+        return job_data
+    
+    def _write_job_file(self, job_id: str, job_data: Dict[str, Any]) -> bool:
+        """Insert or replace a job record"""
+        try:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO jobs "
+                "(status, progress, current_step, created_at, updated_at, completed_at, "
+                "duration_seconds, data, config, job_id) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._row_values(job_data)
+            )
+            return True
+        except (sqlite3.Error, TypeError) as e:
+            logger.error(f"Failed to write job {job_id}: {e}")
+            return False
+    
+    def _update_job_file(self, job_id: str, updates: Dict[str, Any]) -> bool:
+        """Apply updates to a job record atomically"""
+        conn = self._connection()
+        
+        try:
+            # Take the write lock up front so concurrent updates can't interleave
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT data, progress, current_step, updated_at FROM jobs WHERE job_id = ?", (job_id,)
+                ).fetchone()
+                if row is None:
+                    conn.execute("ROLLBACK")
+                    return False
+                
+                job_data = self._load_row(row)
+                job_data.update(updates)
+                job_data['updated_at'] = datetime.utcnow().isoformat()
+                
+                conn.execute(
+                    "UPDATE jobs SET status = ?, progress = ?, current_step = ?, updated_at = ?, "
+                    "completed_at = ?, duration_seconds = ?, data = ? WHERE job_id = ?",
+                    (
+                        job_data['status'],
+                        job_data.get('progress'),
+                        job_data.get('current_step'),
+                        job_data['updated_at'],
+                        job_data.get('completed_at'),
+                        job_data.get('duration_seconds'),
+                        orjson.dumps(job_data).decode(),
+                        job_id
+                    )
+                )
+                conn.execute("COMMIT")
+                return True
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        except (sqlite3.Error, ValueError, TypeError) as e:
+            logger.error(f"Failed to update job {job_id}: {e}")
+            return False
+    
+    def update_job_progress(self, job_id: str, progress: int, step: str = None):
+        """Update job progress percentage"""
+        # Progress ticks of a running job only touch the progress columns;
+        # anything else (e.g. the first tick setting started_at) takes the full update
+        try:
+            cursor = self._connection().execute(
+                "UPDATE jobs SET progress = ?, current_step = COALESCE(?, current_step), updated_at = ? "
+                "WHERE job_id = ? AND status = ? AND json_extract(data, '$.started_at') IS NOT NULL",
+                (
+                    min(100, max(0, progress)),
+                    step,
+                    datetime.utcnow().isoformat(),
+                    job_id,
+                    JobStatus.PROCESSING.value
+                )
+            )
+        except sqlite3.Error as e:
+            # A missed progress tick must not abort the encode reporting it
+            logger.warning(f"Failed to update progress of job {job_id}: {e}")
+            return
+        
+        if cursor.rowcount == 0:
+            super().update_job_progress(job_id, progress, step)
+        elif step:
+            logger.info(f"Job {job_id}: {step}")
+    
+    def list_jobs(self, status: Optional[JobStatus] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """List jobs with optional status filter, most recently updated first"""
+        if status is None:
+            rows = self._connection().execute(
+                "SELECT data, progress, current_step, updated_at FROM jobs "
+                "ORDER BY updated_at DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        else:
+            rows = self._connection().execute(
+                "SELECT data, progress, current_step, updated_at FROM jobs WHERE status = ? "
+                "ORDER BY updated_at DESC LIMIT ?",
+                (status.value, limit)
+            ).fetchall()
+        
+        jobs = []
+        for row in rows:
+            list_data = self._load_row(row)
+            list_data.pop('result', None)  # Also remove large result data
+            jobs.append(list_data)
+        
+        return jobs
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get job statistics"""
+        conn = self._connection()
+        
+        status_counts = {status.value: 0 for status in JobStatus}
+        for status, count in conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"):
+            if status in status_counts:
+                status_counts[status] = count
+        
+        avg_duration = conn.execute(
+            "SELECT AVG(duration_seconds) FROM jobs WHERE status = ? AND duration_seconds > 0",
+            (JobStatus.COMPLETED.value,)
+        ).fetchone()[0] or 0
+        
+        return {
+            "total_jobs": sum(status_counts.values()),
+            "status_counts": status_counts,
+            "average_duration_seconds": round(avg_duration, 1),
+            "active_workers": len(self.executor._threads) if hasattr(self.executor, '_threads') else 0,
+            "max_workers": self.executor._max_workers
+        }
+    
+    def _job_finished(self, job_id: str) -> None:
+        """Schedule removal of a finished job"""
+        self._schedule_expiry(job_id)
+    
+    def _remove_job(self, job_id: str) -> None:
+        """Delete a job record"""
+        self._connection().execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+    
+    def _cleanup_old_jobs(self):
+        """Remove expired jobs and schedule removal of other finished jobs"""
+        conn = self._connection()
+        cutoff_time = (datetime.utcnow() - JOB_RETENTION).isoformat()
+        
+        cursor = conn.execute(
+            "DELETE FROM jobs WHERE status IN (?, ?, ?) AND completed_at < ?",
+            (*_FINISHED_STATUSES, cutoff_time)
+        )
+        
+        if cursor.rowcount > 0:
+            logger.info(f"Cleaned up {cursor.rowcount} old jobs")
+        
+        rows = conn.execute(
+            "SELECT job_id, completed_at FROM jobs WHERE status IN (?, ?, ?) AND completed_at IS NOT NULL",
+            _FINISHED_STATUSES
+        ).fetchall()
+        for job_id, completed_at in rows:
+            try:
+                finished_at = datetime.fromisoformat(completed_at).replace(tzinfo=timezone.utc).timestamp()
+            except ValueError:
+                continue
+            self._schedule_expiry(job_id, finished_at)
@@ -123,16 +123,17 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         Returns:
             ASS events string
         """
-        events = ""
+        # Collect lines and join once instead of growing a string per event
+        lines: List[str] = []
         
         for transcription_result, scene_timing in valid_transcriptions:
             if subtitle_config.style == "progressive" and hasattr(transcription_result, 'word_timestamps'):
                 # Generate progressive word-by-word events
-                events += self._generate_progressive_events(
+                lines.extend(self._generate_progressive_events(
                     transcription_result, 
                     scene_timing, 
                     subtitle_config
-                )
+                ))
             else:
                 # Generate classic full-line events
                 start_time = format_ass_time(scene_timing.start_time)
@@ -142,11 +143,11 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
                 clean_text = self._clean_text_for_ass(transcription_result.transcription)
                 
                 # Add dialogue line
-                events += f"Dialogue: 0,{start_time},{end_time},Default,,0,0,0,,{clean_text}\n"
+                lines.append(f"Dialogue: 0,{start_time},{end_time},Default,,0,0,0,,{clean_text}\n")
         
-        return events
+        return ''.join(lines)
     
-    def _generate_progressive_events(self, transcription_result, scene_timing, subtitle_config: SubtitleSettings) -> str:
+    def _generate_progressive_events(self, transcription_result, scene_timing, subtitle_config: SubtitleSettings) -> List[str]:
         """
         Generate progressive word-by-word subtitle events for TikTok-style animation
         
@@ -156,14 +157,14 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             subtitle_config: Subtitle configuration
             
         Returns:
-            Progressive ASS events string
+            Progressive ASS event lines
         """
-        events = ""
+        events: List[str] = []
         
         # Get word timestamps - progressive mode requires word timestamps
         if not (hasattr(transcription_result, 'word_timestamps') and transcription_result.word_timestamps):
             logger.warning("Progressive subtitles require word timestamps, skipping")
-            return ""
+            return events
         
         words = transcription_result.word_timestamps
         
@@ -202,7 +203,7 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
                 end_time = format_ass_time(subtitle_end)
                 
                 # Add single word dialogue line
-                events += f"Dialogue: 0,{start_time},{end_time},Default,,0,0,0,,{clean_text}\n"
+                events.append(f"Dialogue: 0,{start_time},{end_time},Default,,0,0,0,,{clean_text}\n")
         
         return events
     
@@ -3,15 +3,15 @@ Audio transcription service using local Whisper.cpp
 """
 import os
 import concurrent.futures
+import itertools
 import threading
 from typing import List, Optional, Dict, Any
 from ..models.video_config import VideoConfig
-from ..models.response_models import SceneTiming, TranscriptionResult
+from ..models.response_models import AudioAnalysisResult, SceneTiming, TranscriptionResult
 from ..config.logging_config import get_logger
 from ..config.settings import settings
 from ..utils.file_utils import cleanup_files
 from ..exceptions.custom_exceptions import TranscriptionError, ServiceUnavailableError
-from .whisper_python_service import WhisperPythonService
 
 logger = get_logger(__name__)
 
@@ -20,21 +20,45 @@ class TranscriptionService:
     """Service for audio transcription using Whisper backend"""
     
     def __init__(self):
-        self.progress_lock = threading.Lock()
-        self.completed_count = 0
-        self.total_count = 0
-        self.whisper_service = WhisperPythonService()
+        # One pool shared by all requests so concurrent jobs queue together
+        # instead of each spinning up its own set of transcription threads
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=settings.transcription_workers,
+            thread_name_prefix="transcription"
+        )
+        self._inflight: Dict[str, concurrent.futures.Future] = {}
+        self._inflight_lock = threading.Lock()
+        
+        # Import only the configured backend; openai-whisper pulls in torch
+        if settings.whisper_backend == 'faster':
+            from .faster_whisper_service import FasterWhisperService
+            self.whisper_service = FasterWhisperService()
+            self._install_hint = "pip install -r requirements-faster.txt"
+        else:
+            from .whisper_python_service import WhisperPythonService
+            self.whisper_service = WhisperPythonService()
+            self._install_hint = "pip install openai-whisper torch"
         
         # Validate that Whisper service is available during initialization
         if not self.whisper_service.is_available():
             error_msg = (
-                "Python Whisper is not available! "
-                "Please install required dependencies: pip install openai-whisper torch"
+                f"Whisper backend '{settings.whisper_backend}' is not available! "
+                f"Please install required dependencies: {self._install_hint}"
             )
             logger.error(error_msg)
             raise ServiceUnavailableError(error_msg)
     
     
+    def preload_model(self) -> None:
+        """Load the Whisper model in the background so the first job doesn't wait for it"""
+        def load():
+            try:
+                self.whisper_service.preload_model()
+            except Exception as e:
+                logger.warning(f"Whisper model preload failed: {e}")
+        
+        threading.Thread(target=load, daemon=True, name="whisper-preload").start()
+    
     def transcribe_audio_url(self, audio_url: str) -> str:
         """
         Transcribe audio from URL using Python Whisper
@@ -63,7 +87,7 @@ class TranscriptionService:
     def transcribe_scene_audios(
         self, 
         config: VideoConfig, 
-        audio_info: List[Dict[str, Any]], 
+        audio_info: List[AudioAnalysisResult], 
         scene_timings: List[SceneTiming], 
         temp_dir: str
     ) -> List[TranscriptionResult]:
@@ -94,10 +118,10 @@ class TranscriptionService:
         # Group audio by scene for transcription
         scene_audio_map = {}
         for info in audio_info:
-            scene_idx = info['scene_index']
+            scene_idx = info.scene_index
             if scene_idx not in scene_audio_map:
                 scene_audio_map[scene_idx] = []
-            scene_audio_map[scene_idx].append(info['url'])
+            scene_audio_map[scene_idx].append(info.url)
         
         # Prepare transcription tasks
         transcription_tasks = []
@@ -111,41 +135,32 @@ class TranscriptionService:
                     'timing': scene_timing
                 })
         
+        # Longest scenes first so short ones fill in around them
+        transcription_tasks.sort(key=lambda task: task['timing'].duration, reverse=True)
+        
         if not transcription_tasks:
             logger.warning("No audio files found for transcription")
             return []
         
-        # Reset progress tracking
-        with self.progress_lock:
-            self.completed_count = 0
-            self.total_count = len(transcription_tasks)
-        
         # Process transcriptions concurrently
         transcription_results = {}
         
-        with concurrent.futures.ThreadPoolExecutor(max_workers=settings.transcription_workers) as executor:
-            # Submit all tasks
-            future_to_task = {
-                executor.submit(self._transcribe_scene_task, task): task
-                for task in transcription_tasks
-            }
-            
-            # Collect results as they complete
-            for future in concurrent.futures.as_completed(future_to_task):
-                try:
-                    result = future.result(timeout=settings.transcription_timeout)
-                    transcription_results[result.scene_index] = result
-                except Exception as e:
-                    task = future_to_task[future]
-                    scene_idx = task['scene_index']
-                    logger.error(f"Transcription task failed for scene {scene_idx}: {e}")
-                    transcription_results[scene_idx] = TranscriptionResult(
-                        scene_index=scene_idx,
-                        transcription=None,
-                        success=False,
-                        error=str(e),
-                        word_timestamps=None
-                    )
+        # Per-call progress; results are collected on this thread only, so
+        # concurrent requests don't share or reset each other's counts
+        total_count = len(transcription_tasks)
+        progress = itertools.count(1)
+        
+        # Identical audio URLs share one transcription, even across requests
+        future_to_tasks: Dict[concurrent.futures.Future, List[Dict[str, Any]]] = {}
+        for task in transcription_tasks:
+            future = self._submit_transcription(task['audio_url'])
+            future_to_tasks.setdefault(future, []).append(task)
+        
+        # Collect results as they complete
+        for future in concurrent.futures.as_completed(future_to_tasks):
+            for task in future_to_tasks[future]:
+                result = self._build_scene_result(task['scene_index'], future, next(progress), total_count)
+                transcription_results[result.scene_index] = result
         
         # Reconstruct results in scene order
         results = []
@@ -165,22 +180,51 @@ class TranscriptionService:
         logger.info(f"Transcription complete: {len(results)} scenes processed")
         return results
     
-    def _transcribe_scene_task(self, task: Dict[str, Any]) -> TranscriptionResult:
+    def _submit_transcription(self, audio_url: str) -> concurrent.futures.Future:
         """
-        Transcribe a single scene's audio (for concurrent processing)
+        Queue an audio URL for transcription on the shared pool
         
         Args:
-            task: Task dictionary with scene info and audio URL
+            audio_url: URL to audio file
             
         Returns:
-            TranscriptionResult for the scene
+            Future resolving to the full Whisper result; an existing future
+            is returned if the same URL is already queued or running
         """
-        scene_idx = task['scene_index']
-        audio_url = task['audio_url']
+        with self._inflight_lock:
+            future = self._inflight.get(audio_url)
+            if future is not None:
+                return future
+            
+            future = self.executor.submit(self.whisper_service.transcribe_url_with_words, audio_url)
+            self._inflight[audio_url] = future
         
+        future.add_done_callback(lambda _: self._release_inflight(audio_url, future))
+        return future
+    
+    def _release_inflight(self, audio_url: str, future: concurrent.futures.Future) -> None:
+        """Forget a finished transcription so later requests re-transcribe"""
+        with self._inflight_lock:
+            if self._inflight.get(audio_url) is future:
+                del self._inflight[audio_url]
+    
+    def _build_scene_result(self, scene_idx: int, future: concurrent.futures.Future,
+                            completed: int, total: int) -> TranscriptionResult:
+        """
+        Build a scene's TranscriptionResult from a finished transcription
+        
+        Args:
+            scene_idx: Scene index
+            future: Completed transcription future
+            completed: Number of scenes finished so far, including this one
+            total: Number of scenes being transcribed
+            
+        Returns:
+            TranscriptionResult for the scene
+        """
         try:
             # Get full transcription result with word timestamps
-            full_result = self.whisper_service.transcribe_url_with_words(audio_url)
+            full_result = future.result()
             transcription = full_result["text"].strip() if "text" in full_result else ""
             
             # Extract word timestamps for progressive subtitles
@@ -190,9 +234,7 @@ class TranscriptionService:
                     if "words" in segment:
                         word_timestamps.extend(segment["words"])
             
-            with self.progress_lock:
-                self.completed_count += 1
-                logger.info(f"✓ [{self.completed_count}/{self.total_count}] Scene {scene_idx} transcribed")
+            logger.info(f"✓ [{completed}/{total}] Scene {scene_idx} transcribed")
             
             return TranscriptionResult(
                 scene_index=scene_idx,
@@ -203,9 +245,7 @@ class TranscriptionService:
             )
             
         except Exception as e:
-            with self.progress_lock:
-                self.completed_count += 1
-                logger.error(f"✗ [{self.completed_count}/{self.total_count}] Scene {scene_idx} failed: {e}")
+            logger.error(f"✗ [{completed}/{total}] Scene {scene_idx} failed: {e}")
             
             return TranscriptionResult(
                 scene_index=scene_idx,
@@ -224,12 +264,18 @@ class TranscriptionService:
         """
         errors = []
         
-        # Check if Python Whisper is available
+        # Check if the configured Whisper backend is available
         if not self.whisper_service.is_available():
-            errors.append("Python Whisper not available - install with: pip install openai-whisper torch")
+            errors.append(
+                f"Whisper backend '{settings.whisper_backend}' not available - "
+                f"install with: {self._install_hint}"
+            )
         else:
             whisper_info = self.whisper_service.get_info()
-            logger.info(f"✓ Python Whisper validated: {whisper_info['best_model']} model available")
+            logger.info(
+                f"✓ Whisper backend '{settings.whisper_backend}' validated: "
+                f"{whisper_info['best_model']} model available"
+            )
         
         if not settings.enable_subtitles:
             logger.info("Subtitles disabled in configuration")
@@ -98,6 +98,11 @@ class WhisperPythonService:
                     logger.error(f"Failed to load model {model_name}: {e}")
                     raise TranscriptionError(f"Failed to load Whisper model: {e}")
     
+    def preload_model(self) -> None:
+        """Load the configured model now instead of on first transcription"""
+        if self.is_available():
+            self._load_model(self.get_best_model())
+    
     def is_available(self) -> bool:
         """Check if Python Whisper is available"""
         return WHISPER_AVAILABLE
@@ -0,0 +1,98 @@
+"""
+In-process caching utilities
+"""
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Hashable, Tuple
+
+
+def _make_key(args: Tuple[Any, ...], kwargs: dict) -> Hashable:
+    """Build a hashable cache key from call arguments"""
+    if kwargs:
+        return args + tuple(sorted(kwargs.items()))
+    return args
+
+
+def ttl_cache(ttl: float, maxsize: int = 128) -> Callable:
+    """
+    Memoize a function's results for a limited time
+
+    Entries expire ``ttl`` seconds after they were computed; the least
+    recently used entry is evicted once ``maxsize`` is exceeded. The
+    wrapped function gains ``cache_clear()`` and ``cache_invalidate(*args)``;
+    a result whose computation overlapped an invalidation of its key is
+    returned but not cached.
+
+    Args:
+        ttl: Time-to-live of each entry in seconds
+        maxsize: Maximum number of cached entries
+
+    Returns:
+        Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        cache: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        lock = threading.Lock()
+        # Invalidation clock: each invalidation takes the next tick and
+        # stamps its key. Stamps beyond maxsize are forgotten by raising
+        # the floor, which every unstamped key then reports.
+        invalidations: "OrderedDict[Hashable, int]" = OrderedDict()
+        clock = 0
+        floor = 0
+
+        def invalidated_at(key: Hashable) -> int:
+            return invalidations.get(key, floor)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _make_key(args, kwargs)
+            now = time.monotonic()
+
+            with lock:
+                entry = cache.get(key)
+                if entry is not None and entry[0] > now:
+                    cache.move_to_end(key)
+                    return entry[1]
+                started_at = clock
+
+            value = func(*args, **kwargs)
+
+            with lock:
+                if invalidated_at(key) > started_at:
+                    # Invalidated while computing; the value may be stale
+                    return value
+                cache[key] = (now + ttl, value)
+                cache.move_to_end(key)
+                while len(cache) > maxsize:
+                    cache.popitem(last=False)
+
+            return value
+
+        def cache_clear() -> None:
+            """Drop all cached entries"""
+            nonlocal clock, floor
+            with lock:
+                cache.clear()
+                invalidations.clear()
+                clock += 1
+                floor = clock
+
+        def cache_invalidate(*args, **kwargs) -> None:
+            """Drop the cached entry for the given arguments"""
+            nonlocal clock, floor
+            key = _make_key(args, kwargs)
+            with lock:
+                cache.pop(key, None)
+                clock += 1
+                invalidations[key] = clock
+                invalidations.move_to_end(key)
+                while len(invalidations) > maxsize:
+                    floor = invalidations.popitem(last=False)[1]
+
+        wrapper.cache_clear = cache_clear
+        wrapper.cache_invalidate = cache_invalidate
+        return wrapper
+
+    return decorator
@@ -3,6 +3,7 @@ File operation utilities
 """
 import os
 import tempfile
+import time
 import requests
 from typing import Optional, List
 import urllib3
@@ -10,12 +11,18 @@ import urllib3
 from ..config.logging_config import get_logger
 from ..config.settings import settings
 from ..exceptions.custom_exceptions import FileOperationError
-from .url_utils import resolve_redirect_url, extract_file_extension
+from .url_utils import _http_session, extract_file_extension
 
 logger = get_logger(__name__)
 
 
-def download_file(url: str, temp_dir: str, file_type: str = "file") -> Optional[str]:
+def download_file(
+    url: str,
+    temp_dir: str,
+    file_type: str = "file",
+    max_bytes: Optional[int] = None,
+    deadline: Optional[float] = None
+) -> Optional[str]:
     """
     Download file from URL to temporary location
     
@@ -23,58 +30,78 @@ def download_file(url: str, temp_dir: str, file_type: str = "file") -> Optional[
         url: File URL
         temp_dir: Temporary directory
         file_type: Type of file for logging (e.g., "audio", "image")
+        max_bytes: Abort once the file grows past this size (None = no limit)
+        deadline: time.monotonic() value by which the download must finish
+            (None = only the per-read DOWNLOAD_TIMEOUT applies)
         
     Returns:
         Path to downloaded file or None if failed
         
     Raises:
-        FileOperationError: If download fails
+        FileOperationError: If download fails or exceeds max_bytes/deadline;
+            a partially written file is removed first
     """
+    temp_path = None
     try:
         logger.info(f"Downloading {file_type}: {url}")
         
-        # Resolve redirects first
-        resolved_url = resolve_redirect_url(url)
+        timeout = settings.download_timeout
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise FileOperationError(f"{file_type.capitalize()} download deadline passed")
+            timeout = min(timeout, remaining)
         
-        # Download file
-        response = requests.get(
-            resolved_url, 
-            timeout=settings.download_timeout, 
-            stream=True
-        )
-        response.raise_for_status()
-        
-        # Determine file extension
-        content_type = response.headers.get('content-type', '')
-        suffix = extract_file_extension(url, content_type)
-        
-        # Create temp file
-        temp_file = tempfile.NamedTemporaryFile(
-            delete=False, 
-            suffix=suffix, 
-            dir=temp_dir
-        )
-        temp_path = temp_file.name
-        temp_file.close()
-        
-        # Write file data
-        with open(temp_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        # The pooled session follows redirects itself
+        with _http_session.get(url, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            
+            content_length = response.headers.get('content-length', '')
+            if max_bytes is not None and content_length.isdigit() and int(content_length) > max_bytes:
+                raise FileOperationError(
+                    f"{file_type.capitalize()} is {content_length} bytes, limit is {max_bytes}"
+                )
+            
+            # Determine file extension
+            content_type = response.headers.get('content-type', '')
+            suffix = extract_file_extension(url, content_type)
+            
+            # Create temp file
+            fd, temp_path = tempfile.mkstemp(suffix=suffix, dir=temp_dir)
+            
+            # Write file data
+            file_size = 0
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=8192):
+                    file_size += len(chunk)
+                    if max_bytes is not None and file_size > max_bytes:
+                        raise FileOperationError(
+                            f"{file_type.capitalize()} exceeds the {max_bytes} byte limit"
+                        )
+                    if deadline is not None and time.monotonic() > deadline:
+                        raise FileOperationError(f"{file_type.capitalize()} download deadline passed")
+                    f.write(chunk)
         
-        file_size = os.path.getsize(temp_path)
         logger.info(f"✓ {file_type.capitalize()} downloaded: {temp_path} ({file_size} bytes)")
         return temp_path
         
-    except requests.RequestException as e:
-        logger.error(f"✗ {file_type.capitalize()} download failed: {e}")
-        raise FileOperationError(f"Failed to download {file_type}: {e}")
-    except Exception as e:
-        logger.error(f"✗ Unexpected error downloading {file_type}: {e}")
+    except BaseException as e:
         # Clean up partial file
-        if 'temp_path' in locals() and os.path.exists(temp_path):
-            os.unlink(temp_path)
-        raise FileOperationError(f"Unexpected error downloading {file_type}: {e}")
+        if temp_path is not None:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+        if isinstance(e, FileOperationError):
+            logger.error(f"✗ {file_type.capitalize()} download aborted: {e}")
+            raise
+        if isinstance(e, requests.RequestException):
+            logger.error(f"✗ {file_type.capitalize()} download failed: {e}")
+            raise FileOperationError(f"Failed to download {file_type}: {e}")
+        if isinstance(e, Exception):
+            logger.error(f"✗ Unexpected error downloading {file_type}: {e}")
+            raise FileOperationError(f"Unexpected error downloading {file_type}: {e}")
+        raise
 
 
 def cleanup_files(file_paths: List[str]) -> None:
@@ -86,10 +113,11 @@ def cleanup_files(file_paths: List[str]) -> None:
     """
     for file_path in file_paths:
         try:
-            if os.path.exists(file_path):
-                os.unlink(file_path)
-                logger.debug(f"Cleaned up file: {file_path}")
-        except Exception as e:
+            os.unlink(file_path)
+            logger.debug(f"Cleaned up file: {file_path}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
             logger.warning(f"Failed to cleanup file {file_path}: {e}")
 
 
@@ -102,19 +130,24 @@ def cleanup_old_files(directory: str, max_age_seconds: int) -> None:
         max_age_seconds: Maximum file age in seconds
     """
     try:
-        import time
         current_time = time.time()
         
-        if not os.path.exists(directory):
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY | os.O_CLOEXEC)
+        except FileNotFoundError:
             return
-            
-        for filename in os.listdir(directory):
-            file_path = os.path.join(directory, filename)
-            if os.path.isfile(file_path):
-                file_age = current_time - os.path.getctime(file_path)
-                if file_age > max_age_seconds:
-                    os.remove(file_path)
-                    logger.info(f"Cleaned up old file: {filename}")
+        
+        # Scan and unlink relative to the directory descriptor (unlinkat)
+        try:
+            with os.scandir(dir_fd) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        file_age = current_time - entry.stat().st_ctime
+                        if file_age > max_age_seconds:
+                            os.unlink(entry.name, dir_fd=dir_fd)
+                            logger.info(f"Cleaned up old file: {entry.name}")
+        finally:
+            os.close(dir_fd)
                     
     except Exception as e:
         logger.error(f"Error during cleanup: {e}")
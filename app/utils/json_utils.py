@@ -0,0 +1,66 @@
+"""
+JSON serialization utilities
+"""
+import dataclasses
+import decimal
+from datetime import date
+from typing import Any, Union
+
+import orjson
+from flask.json.provider import JSONProvider
+from werkzeug.http import http_date
+
+
+def _default(o: Any) -> Any:
+    """
+    Serialize types orjson does not handle natively (or handles differently)
+
+    Args:
+        o: Object to serialize
+
+    Returns:
+        JSON-serializable representation
+    """
+    # Keep Flask's HTTP date format for datetimes
+    if isinstance(o, date):
+        return http_date(o)
+
+    if isinstance(o, decimal.Decimal):
+        return str(o)
+
+    if dataclasses.is_dataclass(o):
+        return dataclasses.asdict(o)
+
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson"""
+
+    #: Sort the keys of JSON objects, as Flask's default provider does
+    sort_keys = True
+
+    def _options(self) -> int:
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return option
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize data as JSON string"""
+        return orjson.dumps(obj, default=_default, option=self._options()).decode()
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        """Deserialize data as JSON"""
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        """Serialize the given arguments as JSON and return a Response"""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=self._options()),
+            mimetype="application/json"
+        )
@@ -14,10 +14,12 @@ def format_ass_time(seconds: Union[int, float]) -> str:
     Returns:
         Formatted time string
     """
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = seconds % 60
-    return f"{hours}:{minutes:02d}:{secs:05.2f}"
+    # Integer centiseconds: one rounding step, and 59.999s carries into the
+    # next minute instead of printing as "60.00"
+    minutes, centiseconds = divmod(round(seconds * 100), 6000)
+    hours, minutes = divmod(minutes, 60)
+    secs, centiseconds = divmod(centiseconds, 100)
+    return f"{hours}:{minutes:02d}:{secs:02d}.{centiseconds:02d}"
 
 
 def format_duration(seconds: Union[int, float]) -> str:
@@ -1,7 +1,10 @@
 """
 URL processing utilities, especially for Google Drive
 """
+import functools
+
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Optional
 from ..config.logging_config import get_logger
 from ..config.settings import settings
@@ -9,11 +12,24 @@ from ..exceptions.custom_exceptions import URLProcessingError
 
 logger = get_logger(__name__)
 
+# Shared session so redirect lookups reuse pooled keep-alive connections;
+# the pool is sized so every concurrent audio probe can keep its connection
+_http_session = requests.Session()
+_http_adapter = HTTPAdapter(
+    pool_connections=settings.audio_analysis_workers,
+    pool_maxsize=settings.audio_analysis_workers
+)
+_http_session.mount('http://', _http_adapter)
+_http_session.mount('https://', _http_adapter)
+
 
+@functools.lru_cache(maxsize=1024)
 def process_gdrive_url(url: str) -> str:
     """
     Process Google Drive URLs to ensure they're in the correct format
     
+    Results are memoized since the same image and audio URLs recur across scenes.
+    
     Args:
         url: Original URL (may be share link or direct link)
         
@@ -69,17 +85,16 @@ def resolve_redirect_url(url: str) -> str:
         if 'drive.google.com' in url:
             logger.debug(f"Resolving Google Drive redirect: {url}")
             
-            # Create session with SSL certificate verification disabled
-            session = requests.Session()
-            
-            response = session.head(
+            # Stream so only the headers are read; the body is never downloaded
+            with _http_session.get(
                 url, 
                 allow_redirects=True, 
+                stream=True,
                 timeout=settings.url_redirect_timeout
-            )
-            response.raise_for_status()
+            ) as response:
+                response.raise_for_status()
+                final_url = response.url
             
-            final_url = response.url
             logger.debug(f"Final URL after redirects: {final_url}")
             return final_url
         
@@ -104,7 +119,7 @@ def validate_url(url: str) -> bool:
         True if URL is accessible, False otherwise
     """
     try:
-        response = requests.head(url, timeout=settings.url_redirect_timeout)
+        response = _http_session.head(url, timeout=settings.url_redirect_timeout)
         return response.status_code < 400
     except:
         return False
@@ -0,0 +1,30 @@
+"""
+Gunicorn configuration for the Video Generator Server
+"""
+import os
+import sys
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '3002')}"
+
+# Each worker process loads its own Whisper model, so keep the process count
+# low and serve concurrent requests (polling, downloads) with threads instead
+workers = int(os.getenv('GUNICORN_WORKERS', '2'))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '600'))
+
+# Serve video downloads with sendfile(2) instead of copying through Python
+sendfile = True
+
+
+def post_worker_init(worker):
+    """Validate FFmpeg, Whisper and file permissions in each worker"""
+    from gunicorn.arbiter import Arbiter
+    from app.main import validate_system_requirements
+    
+    try:
+        validate_system_requirements()
+    except SystemExit:
+        # A plain worker exit would be respawned in a loop; a boot error
+        # makes the master shut down instead
+        sys.exit(Arbiter.WORKER_BOOT_ERROR)